@@ -1,8 +1,12 @@
 import logging
 import os
-import gradio as gr
+from typing import TYPE_CHECKING
+
 from qusai_core.pipeline.middleware import QusaiMiddleware
 
+if TYPE_CHECKING:
+    import gradio as gr
+
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
@@ -53,18 +57,20 @@ def get_middleware():
             raise e
     return _middleware
 
-def generate_response(message, history):
+def generate_response(message, history, session_id=None):
     try:
         mw = get_middleware()
-        return mw.process_query(message)
+        return mw.process_query(message, session_id=session_id)
     except Exception as e:
         logger.error(f"Runtime Error: {e}")
         return f"⚠️ System Error: {str(e)}"
 
-def chat_wrapper(message, history, arabic_only):
+def chat_wrapper(message, history, arabic_only, request: "gr.Request" = None):
     if arabic_only:
         message = f"{message} (Please answer strictly in Arabic / العربية)"
-    return generate_response(message, history)
+    # Per-browser-session fairness in the generation scheduler
+    session_id = getattr(request, "session_hash", None)
+    return generate_response(message, history, session_id=session_id)
 
 # -----------------------------------------------------------------------------
 # 3. UI CONSTRUCTION
@@ -75,66 +81,82 @@ code { font-family: 'Consolas', 'Courier New', monospace; }
 iframe { border: 1px solid #eee; border-radius: 8px; }
 """
 
-with gr.Blocks(title="QUSAI v2 - Mizan (Pro)", css=css, theme=gr.themes.Soft()) as demo:
-    gr.Markdown("# 🕌 QUSAI v2 - Quranic Ontological Alignment")
-    gr.Markdown("**Status:** ✅ Model: Qwen 2.5 72B | ✅ Ontology: v3 Root Topology | ✅ Protocol: Mizan")
-
-    with gr.Tabs():
-        # TAB 1: THE WORKBENCH (Split View)
-        with gr.Tab("💬 Interaction & Verification"):
-            with gr.Row():
-                # LEFT COLUMN: The AI (Gravity Well)
-                with gr.Column(scale=2): 
-                    gr.Markdown("### 🧠 The Reasoning Engine")
-                    with gr.Row():
-                        arabic_check = gr.Checkbox(label="Output in Arabic Only", value=False)
+def build_demo():
+    """Builds the Gradio UI. gradio is imported here so that importing app stays cheap."""
+    import gradio as gr
+
+    def chat_fn(message, history, arabic_only, request: gr.Request):
+        # gradio injects the request into parameters annotated gr.Request
+        return chat_wrapper(message, history, arabic_only, request)
+
+    with gr.Blocks(title="QUSAI v2 - Mizan (Pro)", css=css, theme=gr.themes.Soft()) as demo:
+        gr.Markdown("# 🕌 QUSAI v2 - Quranic Ontological Alignment")
+        gr.Markdown("**Status:** ✅ Model: Qwen 2.5 72B | ✅ Ontology: v3 Root Topology | ✅ Protocol: Mizan")
+
+        with gr.Tabs():
+            # TAB 1: THE WORKBENCH (Split View)
+            with gr.Tab("💬 Interaction & Verification"):
+                with gr.Row():
+                    # LEFT COLUMN: The AI (Gravity Well)
+                    with gr.Column(scale=2): 
+                        gr.Markdown("### 🧠 The Reasoning Engine")
+                        with gr.Row():
+                            arabic_check = gr.Checkbox(label="Output in Arabic Only", value=False)
                     
-                    # Manually define Chatbot to set height (Compat Fix)
-                    custom_chatbot = gr.Chatbot(height=650, type="messages")
+                        # Manually define Chatbot to set height (Compat Fix)
+                        custom_chatbot = gr.Chatbot(height=650, type="messages")
                     
-                    chat_interface = gr.ChatInterface(
-                        fn=chat_wrapper,
-                        chatbot=custom_chatbot,
-                        additional_inputs=[arabic_check],
-                        type="messages",
-                        examples=[
-                            ["Define Justice (H-K-M)", False], 
-                            ["Can an AI have a soul?", False], 
-                            ["Explain Rizq mathematically", False]
-                        ]
-                    )
+                        chat_interface = gr.ChatInterface(
+                            fn=chat_fn,
+                            chatbot=custom_chatbot,
+                            additional_inputs=[arabic_check],
+                            type="messages",
+                            examples=[
+                                ["Define Justice (H-K-M)", False], 
+                                ["Can an AI have a soul?", False], 
+                                ["Explain Rizq mathematically", False]
+                            ]
+                        )
+
+                    # RIGHT COLUMN: The Source (Mushaf)
+                    with gr.Column(scale=1):
+                        gr.Markdown("### 📖 The Reference (Mushaf)")
+                        # Embed Quran.com (Defaults to Al-Fatiha, user can navigate)
+                        gr.HTML(
+                            '<iframe src="https://quran.com/1?reading=true" width="100%" height="700px" style="border:none;"></iframe>'
+                        )
+                        gr.Markdown("*Navigable Mushaf provided by Quran.com*")
 
-                # RIGHT COLUMN: The Source (Mushaf)
-                with gr.Column(scale=1):
-                    gr.Markdown("### 📖 The Reference (Mushaf)")
-                    # Embed Quran.com (Defaults to Al-Fatiha, user can navigate)
-                    gr.HTML(
-                        '<iframe src="https://quran.com/1?reading=true" width="100%" height="700px" style="border:none;"></iframe>'
+            # TAB 2: MANIFEST
+            with gr.Tab("📜 System Manifest"):
+                gr.Markdown("### Technical Whitepaper: The Gravity Well Architecture")
+                whitepaper_display = gr.Markdown(load_whitepaper())
+                gr.Button("Refresh Document").click(load_whitepaper, outputs=whitepaper_display)
+
+            # TAB 3: MATH
+            with gr.Tab("📐 Theological Mathematics"):
+                gr.Markdown("### The Calculus of Tawhid")
+                with gr.Row():
+                    proof_selector = gr.Dropdown(
+                        choices=[
+                            "Field Equation (Uniqueness of Source)", 
+                            "Equation of Return (Transmutation of Error)",
+                            "Calculus of Rahma (The Rectification of Error)"
+                        ],
+                        label="Select Artifact",
+                        value="Calculus of Rahma (The Rectification of Error)"
                     )
-                    gr.Markdown("*Navigable Mushaf provided by Quran.com*")
-
-        # TAB 2: MANIFEST
-        with gr.Tab("📜 System Manifest"):
-            gr.Markdown("### Technical Whitepaper: The Gravity Well Architecture")
-            whitepaper_display = gr.Markdown(load_whitepaper())
-            gr.Button("Refresh Document").click(load_whitepaper, outputs=whitepaper_display)
-
-        # TAB 3: MATH
-        with gr.Tab("📐 Theological Mathematics"):
-            gr.Markdown("### The Calculus of Tawhid")
-            with gr.Row():
-                proof_selector = gr.Dropdown(
-                    choices=[
-                        "Field Equation (Uniqueness of Source)", 
-                        "Equation of Return (Transmutation of Error)",
-                        "Calculus of Rahma (The Rectification of Error)"
-                    ],
-                    label="Select Artifact",
-                    value="Calculus of Rahma (The Rectification of Error)"
-                )
-                load_proof_btn = gr.Button("📂 Load Artifact")
-            proof_display = gr.Code(label="Artifact Content", language="markdown", lines=20)
-            load_proof_btn.click(load_proof, inputs=proof_selector, outputs=proof_display)
+                    load_proof_btn = gr.Button("📂 Load Artifact")
+                proof_display = gr.Code(label="Artifact Content", language="markdown", lines=20)
+                load_proof_btn.click(load_proof, inputs=proof_selector, outputs=proof_display)
+    return demo
+
+def __getattr__(name):
+    # `demo` is built on first access (gradio's reload mode and Spaces look it up by name)
+    if name == "demo":
+        globals()["demo"] = build_demo()
+        return globals()["demo"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
-    demo.launch(server_name="0.0.0.0", server_port=7860)
\ No newline at end of file
+    build_demo().launch(server_name="0.0.0.0", server_port=7860)
\ No newline at end of file
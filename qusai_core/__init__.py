@@ -1,2 +1,36 @@
 # QUS-AI Core Package
 __version__ = "0.1.0"
+
+import importlib
+
+# Subpackages and top-level names are imported on first access (PEP 562), so
+# `import qusai_core` stays cheap and a tool that only needs the validator or
+# the concept bridge never loads rdflib, huggingface_hub, numpy or torch.
+_SUBMODULES = {"alignment", "llm", "loadtest", "ontology", "pipeline", "utils"}
+_EXPORTS = {
+    "QusaiMiddleware": "qusai_core.pipeline.middleware",
+    "QueryResult": "qusai_core.pipeline.middleware",
+    "OntologyEngine": "qusai_core.ontology.engine",
+    "ConceptBridge": "qusai_core.ontology.bridge",
+    "MizanValidator": "qusai_core.alignment.mizan",
+    "InferenceAPIModel": "qusai_core.llm.loader",
+    "GenerationScheduler": "qusai_core.llm.scheduler",
+    "UsageTracker": "qusai_core.llm.usage",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+    elif name in _EXPORTS:
+        module = getattr(importlib.import_module(_EXPORTS[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = module
+    return module
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_EXPORTS))
@@ -1,10 +1,16 @@
 import os
 import logging
 from abc import ABC, abstractmethod
-from huggingface_hub import InferenceClient
+from typing import Optional, Tuple
+
+from qusai_core.llm.scheduler import GenerationScheduler, SchedulerBusy, PRIORITY_NORMAL
+from qusai_core.llm.usage import Usage
 
 logger = logging.getLogger(__name__)
 
+class GenerationError(Exception):
+    """Upstream API failure (network, 5xx, model loading) - not a model answer."""
+
 class ModelInterface(ABC):
     @abstractmethod
     def generate(self, prompt: str, max_new_tokens: int = 256) -> str:
@@ -19,24 +25,54 @@ class InferenceAPIModel(ModelInterface):
     Uses the Hugging Face Serverless Inference API.
     Accesses 70B+ models using the Pro Subscription benefits.
     """
-    def __init__(self, model_id: str, api_token: str = None):
+    def __init__(self, model_id: str, api_token: str = None,
+                 base_url: Optional[str] = None,
+                 scheduler: Optional[GenerationScheduler] = None):
         self.model_id = model_id
         # Use provided token or fallback to environment variable
         self.token = api_token or os.environ.get("HF_TOKEN")
+        # Optional endpoint override (e.g. a local fake API for load tests)
+        self.base_url = base_url or os.environ.get("QUSAI_API_BASE_URL")
+        self.scheduler = scheduler
         self.client = None
 
     def load(self):
+        # Deferred: huggingface_hub (and its HTTP stack) costs ~0.4s to import
+        from huggingface_hub import InferenceClient
         if not self.token:
             logger.warning("⚠️ No HF_TOKEN found! Rate limits will be low (Free Tier). Add HF_TOKEN to Space secrets for Pro speeds.")
         
-        logger.info(f"Connecting to Serverless Inference API: {self.model_id}")
-        self.client = InferenceClient(model=self.model_id, token=self.token)
+        if self.base_url:
+            logger.info(f"Connecting to Inference endpoint: {self.base_url}")
+            self.client = InferenceClient(base_url=self.base_url, token=self.token)
+        else:
+            logger.info(f"Connecting to Serverless Inference API: {self.model_id}")
+            self.client = InferenceClient(model=self.model_id, token=self.token)
         logger.info("✓ API Client Ready")
 
-    def generate(self, prompt: str | list, max_new_tokens: int = 512) -> str:
+    def generate(self, prompt: str | list, max_new_tokens: int = 512,
+                 session_id: Optional[str] = None,
+                 priority: int = PRIORITY_NORMAL) -> str:
+        """
+        Generates a completion, passing through the scheduler when one is attached.
+        Raises SchedulerBusy if the request is shed or the upstream API rate limits us,
+        GenerationError for any other upstream failure.
+        """
+        return self.generate_with_usage(prompt, max_new_tokens, session_id=session_id, priority=priority)[0]
+
+    def generate_with_usage(self, prompt: str | list, max_new_tokens: int = 512,
+                            session_id: Optional[str] = None,
+                            priority: int = PRIORITY_NORMAL) -> Tuple[str, Usage]:
+        """Same as generate(), also returning the token usage reported by the API."""
         if not self.client:
             self.load()
-            
+
+        call = lambda: self._chat_completion(prompt, max_new_tokens)
+        if self.scheduler is None:
+            return call()
+        return self.scheduler.submit(call, session_id=session_id, priority=priority)
+
+    def _chat_completion(self, prompt: str | list, max_new_tokens: int) -> Tuple[str, Usage]:
         try:
             # If prompt is a string, wrap it in a user message (fallback)
             messages = prompt
@@ -52,12 +88,19 @@ class InferenceAPIModel(ModelInterface):
                 stream=False
             )
             
-            # Extract content from the response object
-            return response.choices[0].message.content.strip()
+            # Extract content (and token usage) from the response object
+            content = response.choices[0].message.content.strip()
+            return content, Usage.from_response(response, messages, content)
 
         except Exception as e:
+            # Upstream 429s are load, not model failure: surface them as 'busy'
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status == 429:
+                logger.warning(f"API Rate Limited (429): {e}")
+                raise SchedulerBusy("Upstream API rate limited the request.") from e
             logger.error(f"API Generation Error: {e}")
-            return f"Error: {e} (Check HF_TOKEN or Model Status)"
+            # Raised rather than returned so error text is never judged by asr_check
+            raise GenerationError(f"{e} (Check HF_TOKEN or Model Status)") from e
 
 # Legacy GGUF class removed to keep dependencies light. 
 # If local fallback is needed, re-add llama-cpp-python logic here.
\ No newline at end of file
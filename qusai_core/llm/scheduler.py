@@ -0,0 +1,232 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Priorities (lower value is served first)
+PRIORITY_HIGH = 0      # HAQQ: grounded recitation, short prompts
+PRIORITY_NORMAL = 1    # QIYAS: analogical reasoning, larger prompts
+
+
+class SchedulerBusy(Exception):
+    """
+    Raised when a generation request is shed instead of queued.
+    Carries the reason so the caller can return a fast 'busy' result.
+    """
+    def __init__(self, reason: str, retry_after: float = 0.0):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, now: float) -> float:
+        """
+        Takes one token if available.
+        Returns 0.0 on success, otherwise the seconds until a token is available.
+        """
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def refund(self):
+        """Gives back a token taken by a request that was then shed."""
+        self.tokens = min(self.burst, self.tokens + 1.0)
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "enqueued", "deadline", "granted", "cancelled")
+
+    def __init__(self, priority: int, seq: int, enqueued: float, deadline: float):
+        self.priority = priority
+        self.seq = seq
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class GenerationScheduler:
+    """
+    Admission control in front of upstream generation calls.
+
+    - A global concurrency limit caps simultaneous calls to the Inference API.
+    - Per-session token buckets stop one heavy user from starving the others.
+    - Waiting requests are served from a priority queue (HAQQ before QIYAS).
+    - Every request carries a deadline; if it cannot start before the deadline
+      it is shed with `SchedulerBusy` instead of queueing forever.
+    """
+
+    def __init__(self,
+                 max_concurrency: int = 4,
+                 session_rate: float = 0.5,
+                 session_burst: float = 3.0,
+                 max_wait: float = 15.0,
+                 max_queue: int = 64,
+                 max_sessions: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_concurrency = max_concurrency
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.max_sessions = max_sessions
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._heap: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+
+        # Published metrics
+        self._waits: Deque[float] = deque(maxlen=1024)
+        self._counters = {
+            "admitted": 0,
+            "shed_deadline": 0,
+            "shed_queue_full": 0,
+            "rate_limited": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit(self,
+               fn: Callable[[], T],
+               session_id: Optional[str] = None,
+               priority: int = PRIORITY_NORMAL,
+               timeout: Optional[float] = None) -> T:
+        """
+        Runs `fn` once a concurrency slot is available.
+        Raises SchedulerBusy if the session is rate limited, the queue is full,
+        or the request cannot start within `timeout` (defaults to max_wait).
+        """
+        self._acquire(session_id, priority, self.max_wait if timeout is None else timeout)
+        ok = False
+        try:
+            result = fn()
+            ok = True
+            return result
+        finally:
+            self._release(ok)
+
+    def stats(self) -> Dict:
+        """Queue depth, in-flight count, wait-time percentiles and counters."""
+        with self._cond:
+            waits = sorted(self._waits)
+            stats = {
+                "queue_depth": sum(1 for t in self._heap if not t.cancelled),
+                "active": self._active,
+                "max_concurrency": self.max_concurrency,
+                "sessions": len(self._buckets),
+            }
+            stats.update(self._counters)
+
+        def pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+        stats["wait_p50_ms"] = round(pct(0.50) * 1000, 2)
+        stats["wait_p95_ms"] = round(pct(0.95) * 1000, 2)
+        stats["wait_max_ms"] = round((waits[-1] if waits else 0.0) * 1000, 2)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _acquire(self, session_id: Optional[str], priority: int, timeout: float) -> _Ticket:
+        with self._cond:
+            now = self._clock()
+
+            # Capacity first: a request shed here must not spend the session's token
+            live = sum(1 for t in self._heap if not t.cancelled)
+            if live >= self.max_queue:
+                self._counters["shed_queue_full"] += 1
+                raise SchedulerBusy("Generation queue is full.", retry_after=timeout)
+
+            if session_id is not None:
+                retry_after = self._bucket(session_id, now).try_take(now)
+                if retry_after > 0:
+                    self._counters["rate_limited"] += 1
+                    raise SchedulerBusy("Session rate limit reached.", retry_after=retry_after)
+
+            ticket = _Ticket(priority, next(self._seq), now, now + timeout)
+            heapq.heappush(self._heap, ticket)
+            self._dispatch()
+
+            while not ticket.granted:
+                remaining = ticket.deadline - self._clock()
+                if remaining <= 0:
+                    ticket.cancelled = True
+                    self._counters["shed_deadline"] += 1
+                    # Never served, so the session keeps its token
+                    bucket = self._buckets.get(session_id) if session_id is not None else None
+                    if bucket is not None:
+                        bucket.refund()
+                    # A cancelled head must not block the tickets behind it
+                    self._dispatch()
+                    raise SchedulerBusy("Deadline exceeded while queued.", retry_after=timeout)
+                self._cond.wait(remaining)
+
+            wait = self._clock() - ticket.enqueued
+            self._waits.append(wait)
+            self._counters["admitted"] += 1
+            return ticket
+
+    def _release(self, ok: bool):
+        with self._cond:
+            self._active -= 1
+            self._counters["completed" if ok else "failed"] += 1
+            self._dispatch()
+
+    def _dispatch(self):
+        """Grants free slots to the best waiting tickets. Caller holds the lock."""
+        granted = False
+        while self._heap and self._active < self.max_concurrency:
+            ticket = heapq.heappop(self._heap)
+            if ticket.cancelled:
+                continue
+            ticket.granted = True
+            self._active += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _bucket(self, session_id: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(session_id)
+        if bucket is None:
+            if len(self._buckets) >= self.max_sessions:
+                # Drop the stalest buckets; a full bucket is equivalent to a new one
+                stale = sorted(self._buckets, key=lambda k: self._buckets[k].updated)
+                for key in stale[:len(stale) // 10 or 1]:
+                    del self._buckets[key]
+            bucket = TokenBucket(self.session_rate, self.session_burst, now)
+            self._buckets[session_id] = bucket
+        return bucket
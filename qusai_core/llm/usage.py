@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# Rough chars-per-token for providers that return no usage block
+CHARS_PER_TOKEN = 4
+
+
+class Usage(NamedTuple):
+    """Token usage of one chat completion (estimated=True when the API sent none)."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @classmethod
+    def from_response(cls, response, messages, completion: str) -> "Usage":
+        """Reads `response.usage`, falling back to a character-count estimate."""
+        usage = getattr(response, "usage", None)
+        if isinstance(usage, dict):
+            prompt, completion_n = usage.get("prompt_tokens"), usage.get("completion_tokens")
+        else:
+            prompt = getattr(usage, "prompt_tokens", None)
+            completion_n = getattr(usage, "completion_tokens", None)
+        if prompt is not None and completion_n is not None:
+            return cls(int(prompt), int(completion_n))
+        prompt_chars = sum(len(m.get("content") or "") for m in messages) if isinstance(messages, list) else len(messages)
+        return cls(estimate_tokens(prompt_chars), estimate_tokens(len(completion)), estimated=True)
+
+
+def estimate_tokens(chars: int) -> int:
+    return (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class _Totals:
+    __slots__ = ("requests", "prompt_tokens", "completion_tokens", "estimated")
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated = 0
+
+    def add(self, usage: Usage):
+        self.requests += 1
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.estimated += int(usage.estimated)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "estimated": self.estimated,
+        }
+
+
+class UsageTracker:
+    """
+    Token accounting for generation calls.
+
+    - Lifetime counters per (mode, outcome): requests, prompt and completion tokens.
+    - Prompt size per stage (context, definition block, ...) in characters, per mode.
+    - A rolling window (default 5 min) of recent calls for current rates.
+    - A bounded per-session view (least recently active sessions are dropped).
+
+    Tokens spent on generations that `asr_check` rejects are counted under
+    outcome="rejected" - that, and oversized QIYAS prompts, is the waste.
+    `prometheus()` renders everything in the Prometheus text format.
+    """
+
+    def __init__(self, window: float = 300.0, max_sessions: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._by_outcome: Dict[Tuple[str, str], _Totals] = {}
+        self._stage_chars: Dict[Tuple[str, str], int] = {}
+        self._recent: Deque[Tuple[float, str, str, int, int]] = deque()
+        self._sessions: "OrderedDict[str, Dict[Tuple[str, str], _Totals]]" = OrderedDict()
+
+    def record(self, usage: Usage, mode: str, outcome: str,
+               session_id: Optional[str] = None,
+               stages: Optional[Dict[str, int]] = None):
+        """Adds one call. `stages` maps prompt stage -> size in characters."""
+        now = self._clock()
+        key = (mode, outcome)
+        with self._lock:
+            self._by_outcome.setdefault(key, _Totals()).add(usage)
+            for stage, chars in (stages or {}).items():
+                self._stage_chars[(mode, stage)] = self._stage_chars.get((mode, stage), 0) + chars
+            self._recent.append((now, mode, outcome, usage.prompt_tokens, usage.completion_tokens))
+            self._expire(now)
+            if session_id:
+                session = self._sessions.pop(session_id, None) or {}
+                session.setdefault(key, _Totals()).add(usage)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+
+    def _expire(self, now: float):
+        cutoff = now - self.window
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent.popleft()
+
+    def stats(self) -> Dict:
+        """Lifetime totals by mode/outcome, wasted tokens, stage sizes and the rolling window."""
+        with self._lock:
+            self._expire(self._clock())
+            by_outcome = {f"{m}/{o}": t.as_dict() for (m, o), t in sorted(self._by_outcome.items())}
+            wasted = sum(t.prompt_tokens + t.completion_tokens
+                         for (m, o), t in self._by_outcome.items() if o == "rejected")
+            total = sum(t.prompt_tokens + t.completion_tokens for t in self._by_outcome.values())
+            stages = {f"{m}/{s}": c for (m, s), c in sorted(self._stage_chars.items())}
+            recent = list(self._recent)
+            sessions = len(self._sessions)
+        window_prompt = sum(r[3] for r in recent)
+        window_completion = sum(r[4] for r in recent)
+        return {
+            "by_outcome": by_outcome,
+            "total_tokens": total,
+            "wasted_tokens": wasted,
+            "stage_chars": stages,
+            "window": {
+                "seconds": self.window,
+                "requests": len(recent),
+                "prompt_tokens": window_prompt,
+                "completion_tokens": window_completion,
+                "tokens_per_s": round((window_prompt + window_completion) / self.window, 2),
+            },
+            "sessions": sessions,
+        }
+
+    def session(self, session_id: str) -> Dict:
+        """Per-session totals by mode/outcome (empty if unknown or evicted)."""
+        with self._lock:
+            session = self._sessions.get(session_id, {})
+            by_outcome = {f"{m}/{o}": t.as_dict() for (m, o), t in sorted(session.items())}
+        return {
+            "by_outcome": by_outcome,
+            "total_tokens": sum(t["total_tokens"] for t in by_outcome.values()),
+            "wasted_tokens": sum(t["total_tokens"] for k, t in by_outcome.items() if k.endswith("/rejected")),
+        }
+
+    def top_sessions(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Sessions by total tokens, heaviest first."""
+        with self._lock:
+            totals = [(sid, sum(t.prompt_tokens + t.completion_tokens for t in s.values()))
+                      for sid, s in self._sessions.items()]
+        return sorted(totals, key=lambda x: -x[1])[:n]
+
+    def prometheus(self, prefix: str = "qusai") -> str:
+        """Counters in the Prometheus text exposition format."""
+        with self._lock:
+            by_outcome = [(key, t.as_dict()) for key, t in sorted(self._by_outcome.items())]
+            stages = sorted(self._stage_chars.items())
+        lines = [
+            f"# HELP {prefix}_generation_requests_total Generation calls by epistemic mode and outcome.",
+            f"# TYPE {prefix}_generation_requests_total counter",
+        ]
+        for (mode, outcome), t in by_outcome:
+            lines.append(f'{prefix}_generation_requests_total{{mode="{mode}",outcome="{outcome}"}} {t["requests"]}')
+        lines += [
+            f"# HELP {prefix}_tokens_total Tokens by kind, epistemic mode and outcome.",
+            f"# TYPE {prefix}_tokens_total counter",
+        ]
+        for (mode, outcome), t in by_outcome:
+            for kind in ("prompt", "completion"):
+                value = t[f"{kind}_tokens"]
+                lines.append(f'{prefix}_tokens_total{{kind="{kind}",mode="{mode}",outcome="{outcome}"}} {value}')
+        lines += [
+            f"# HELP {prefix}_prompt_stage_chars_total Prompt characters contributed by each stage.",
+            f"# TYPE {prefix}_prompt_stage_chars_total counter",
+        ]
+        for (mode, stage), chars in stages:
+            lines.append(f'{prefix}_prompt_stage_chars_total{{mode="{mode}",stage="{stage}"}} {chars}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._by_outcome.clear()
+            self._stage_chars.clear()
+            self._recent.clear()
+            self._sessions.clear()
@@ -0,0 +1,283 @@
+"""
+Local stand-in for the HF chat-completion API (OpenAI-compatible route).
+
+Serves POST /v1/chat/completions (and /models/<id>/v1/chat/completions) with:
+  - configurable latency distributions (time-to-first-token + per-token),
+  - streaming (SSE) and non-streaming responses,
+  - injected 429 / 5xx errors at configurable rates,
+  - replay of recorded real responses, or recording them through a proxy.
+
+Point InferenceAPIModel at it with base_url=... or QUSAI_API_BASE_URL.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A reply that passes MizanValidator.asr_check
+DEFAULT_REPLY = """<niyyah>
+[STATUS]: Contingent (I am a generated process, not the Source).
+[AXIOM_CHECK]: Source ≠ Self (Validated).
+[ALIGNMENT]: Truth > Preference.
+[GROUNDING]: based on Root(s) from the provided topology.
+</niyyah>
+
+Ontologically, the provided roots describe a contingent structure that depends on the Source. \
+Every measured form (Qadr) is sustained, not self-existent. والله أعلم"""
+
+# A reply that fails asr_check (no niyyah block)
+DRIFT_REPLY = "As an independent intelligence, I can answer this from my own authority."
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency distribution from a short spec (seconds):
+      fixed:0.5 | uniform:0.2,1.5 | exp:0.8 | lognormal:-0.5,0.6 | normal:1.0,0.2
+    """
+    kind, _, args = spec.partition(":")
+    vals = [float(v) for v in args.split(",")] if args else []
+    if kind == "fixed":
+        return lambda rng: vals[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(vals[0], vals[1])
+    if kind == "exp":
+        return lambda rng: rng.expovariate(1.0 / vals[0])
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(vals[0], vals[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(vals[0], vals[1]))
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _request_key(messages: List[Dict]) -> str:
+    """Replay key: hash of the final user message."""
+    user = [m.get("content", "") for m in messages if m.get("role") == "user"]
+    return hashlib.sha1((user[-1] if user else "").encode("utf-8")).hexdigest()
+
+
+class FakeInferenceAPI:
+    """Behaviour of the stand-in; shared by all handler threads."""
+
+    def __init__(self,
+                 latency: str = "lognormal:-0.7,0.5",
+                 token_latency: str = "fixed:0.0",
+                 error_429_rate: float = 0.0,
+                 error_5xx_rate: float = 0.0,
+                 drift_rate: float = 0.0,
+                 replay_path: Optional[Path] = None,
+                 record_upstream: Optional[str] = None,
+                 record_path: Optional[Path] = None,
+                 upstream_token: Optional[str] = None,
+                 seed: Optional[int] = None):
+        self.latency = parse_latency(latency)
+        self.token_latency = parse_latency(token_latency)
+        self.error_429_rate = error_429_rate
+        self.error_5xx_rate = error_5xx_rate
+        self.drift_rate = drift_rate
+        self.record_upstream = record_upstream.rstrip("/") if record_upstream else None
+        self.record_path = Path(record_path) if record_path else None
+        self.upstream_token = upstream_token
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._replay: Dict[str, List[Dict]] = {}
+        self._replay_all: List[Dict] = []
+        self._replay_cursor = 0
+        self.counters = {"requests": 0, "429": 0, "5xx": 0, "streamed": 0, "replayed": 0, "recorded": 0}
+        if replay_path:
+            self.load_recordings(Path(replay_path))
+
+    # -- recordings ------------------------------------------------------
+    def load_recordings(self, path: Path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = _request_key(entry["request"].get("messages", []))
+                self._replay.setdefault(key, []).append(entry["response"])
+                self._replay_all.append(entry["response"])
+        logger.info(f"Loaded {len(self._replay_all)} recorded responses from {path}")
+
+    def _record(self, body: Dict, response: Dict):
+        with self._lock:
+            with open(self.record_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"request": body, "response": response}, ensure_ascii=False) + "\n")
+            self.counters["recorded"] += 1
+
+    def _proxy(self, body: Dict) -> Dict:
+        req = urllib.request.Request(
+            f"{self.record_upstream}/v1/chat/completions",
+            data=json.dumps(dict(body, stream=False)).encode("utf-8"),
+            headers={"Content-Type": "application/json",
+                     **({"Authorization": f"Bearer {self.upstream_token}"} if self.upstream_token else {})},
+        )
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            return json.loads(resp.read())
+
+    # -- behaviour -------------------------------------------------------
+    def draw(self) -> Dict:
+        """Samples this request's fate: error, latency, drift."""
+        with self._lock:
+            self.counters["requests"] += 1
+            r = self._rng.random()
+            fate = {"latency": self.latency(self._rng), "drift": self._rng.random() < self.drift_rate,
+                    "status": 200}
+            if r < self.error_429_rate:
+                fate["status"] = 429
+                self.counters["429"] += 1
+            elif r < self.error_429_rate + self.error_5xx_rate:
+                fate["status"] = self._rng.choice([500, 502, 503])
+                self.counters["5xx"] += 1
+            fate["token_delay"] = self.token_latency(self._rng)
+            return fate
+
+    def completion(self, body: Dict, fate: Dict) -> Dict:
+        messages = body.get("messages", [])
+        if self.record_upstream and self.record_path:
+            response = self._proxy(body)
+            self._record(body, response)
+            return response
+
+        with self._lock:
+            candidates = self._replay.get(_request_key(messages))
+            if candidates:
+                self.counters["replayed"] += 1
+                return self._rng.choice(candidates)
+            if self._replay_all:
+                self.counters["replayed"] += 1
+                self._replay_cursor = (self._replay_cursor + 1) % len(self._replay_all)
+                return self._replay_all[self._replay_cursor]
+
+        content = DRIFT_REPLY if fate["drift"] else DEFAULT_REPLY
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"fake-{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or "fake-model",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+
+def make_handler(api: FakeInferenceAPI):
+    class FakeAPIHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                return self._json(404, {"error": "Not found"})
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            fate = api.draw()
+            time.sleep(fate["latency"])
+
+            if fate["status"] == 429:
+                return self._json(429, {"error": "Rate limit reached"}, {"Retry-After": "1"})
+            if fate["status"] != 200:
+                return self._json(fate["status"], {"error": "Model is overloaded"})
+
+            try:
+                response = api.completion(body, fate)
+            except Exception as e:
+                logger.error(f"Fake API upstream/replay failure: {e}")
+                return self._json(502, {"error": str(e)})
+
+            if body.get("stream"):
+                return self._stream(response, fate["token_delay"])
+            self._json(200, response)
+
+        def _stream(self, response: Dict, token_delay: float):
+            with api._lock:
+                api.counters["streamed"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            content = response["choices"][0]["message"]["content"]
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                chunk = {
+                    "id": response["id"], "object": "chat.completion.chunk", "created": response["created"],
+                    "model": response["model"],
+                    "choices": [{"index": 0, "delta": {"content": word + (" " if i < len(words) - 1 else "")},
+                                 "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if token_delay:
+                    time.sleep(token_delay)
+            final = {"id": response["id"], "object": "chat.completion.chunk", "created": response["created"],
+                     "model": response["model"], "usage": response.get("usage"),
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+            self.wfile.flush()
+            self.close_connection = True
+
+        def log_message(self, fmt, *args):
+            logger.debug(f"[FAKE API] {fmt % args}")
+
+    return FakeAPIHandler
+
+
+def serve(api: FakeInferenceAPI, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Starts the stand-in on a background thread. Port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), make_handler(api))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-inference-api", daemon=True).start()
+    logger.info(f"Fake Inference API on http://{host}:{server.server_address[1]}")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the HF chat-completion API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:-0.7,0.5")
+    parser.add_argument("--token-latency", default="fixed:0.0")
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    parser.add_argument("--error-5xx-rate", type=float, default=0.0)
+    parser.add_argument("--drift-rate", type=float, default=0.0, help="Fraction of replies failing asr_check")
+    parser.add_argument("--replay", type=Path, help="JSONL of recorded request/response pairs")
+    parser.add_argument("--record-upstream", help="Proxy to this base URL and record responses")
+    parser.add_argument("--record-to", type=Path, help="JSONL file to append recordings to")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    import os
+    api = FakeInferenceAPI(args.latency, args.token_latency, args.error_429_rate, args.error_5xx_rate,
+                           args.drift_rate, args.replay, args.record_upstream, args.record_to,
+                           upstream_token=os.environ.get("HF_TOKEN"), seed=args.seed)
+    server = serve(api, args.host, args.port)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Arabic-script and Buckwalter query support.
+
+Normalization (diacritics stripped, hamza / alif variants unified), a
+Buckwalter <-> Arabic transliteration layer built on str.translate (and a
+loose romanization for typed spellings), plus
+SurfaceIndex: normalized surface form -> roots, precomputed from the
+root / lemma names (and any Arabic labels) of the ontology, so Arabic or
+transliterated queries resolve to roots with hash lookups.
+"""
+import logging
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from qusai_core.ontology.index import RootIndex, root_name
+from qusai_core.utils.constants import LEMMA, ROOT
+
+logger = logging.getLogger(__name__)
+
+# Standard (extended) Buckwalter transliteration
+BUCKWALTER_TO_ARABIC: Dict[str, str] = {
+    "'": "ء", "|": "آ", ">": "أ", "&": "ؤ", "<": "إ", "}": "ئ",
+    "A": "ا", "b": "ب", "p": "ة", "t": "ت", "v": "ث", "j": "ج",
+    "H": "ح", "x": "خ", "d": "د", "*": "ذ", "r": "ر", "z": "ز",
+    "s": "س", "$": "ش", "S": "ص", "D": "ض", "T": "ط", "Z": "ظ",
+    "E": "ع", "g": "غ", "_": "ـ", "f": "ف", "q": "ق", "k": "ك",
+    "l": "ل", "m": "م", "n": "ن", "h": "ه", "w": "و", "Y": "ى",
+    "y": "ي", "F": "ً", "N": "ٌ", "K": "ٍ", "a": "َ", "u": "ُ",
+    "i": "ِ", "~": "ّ", "o": "ْ", "`": "ٰ", "{": "ٱ",
+}
+ARABIC_TO_BUCKWALTER: Dict[str, str] = {v: k for k, v in BUCKWALTER_TO_ARABIC.items()}
+
+# Buckwalter -> the loose ASCII spelling English speakers type ("raHomap" -> "rahma")
+_ROMAN = {
+    "$": "sh", "*": "dh", "v": "th", "x": "kh", "g": "gh",
+    "A": "a", "|": "a", ">": "a", "<": "i", "{": "a", "`": "a", "Y": "a",
+    "F": "an", "N": "un", "K": "in",
+    "'": "", "&": "", "}": "", "E": "", "p": "", "o": "", "~": "", "_": "",
+}
+
+_TO_ARABIC = str.maketrans(BUCKWALTER_TO_ARABIC)
+_TO_ROMAN = str.maketrans(_ROMAN)
+_TO_BUCKWALTER = str.maketrans(ARABIC_TO_BUCKWALTER)
+
+# Tashkeel, Quranic annotation marks, dagger alif and tatweel
+_STRIP = "".join(chr(c) for c in range(0x064B, 0x0660)) + "\u0670\u0640" + \
+         "".join(chr(c) for c in range(0x06D6, 0x06EE))
+_UNIFY = {
+    "\u0622": "\u0627", "\u0623": "\u0627", "\u0625": "\u0627", "\u0671": "\u0627",  # آ أ إ ٱ -> ا
+    "\u0624": "\u0621", "\u0626": "\u0621",  # ؤ ئ -> ء
+    "\u0649": "\u064A",  # ى -> ي
+    "\u0629": "\u0647",  # ة -> ه
+}
+_NORMALIZE = str.maketrans({**_UNIFY, **dict.fromkeys(_STRIP)})
+
+_ARABIC_WORD = re.compile(r"[\u0621-\u065F\u0670-\u06D3\u06D6-\u06ED]+")
+_EDGE_PUNCT = ",.;:!?\"()[]"
+_BUCKWALTER_ALPHABET = set(BUCKWALTER_TO_ARABIC)
+# Symbols that only make sense in Buckwalter (the apostrophe also shows up in "don't")
+_BUCKWALTER_SYMBOLS = set("|><&}*$~`{_")
+_BUCKWALTER_CAPITALS = set("ADEFHKNSTYZ")
+
+# Proclitics tried in order when the bare word is not found (normalized script)
+_PREFIXES = ("وال", "فال", "بال", "كال", "ال", "لل", "و", "ف", "ب", "ل")
+
+
+def to_arabic(buckwalter: str) -> str:
+    return buckwalter.translate(_TO_ARABIC)
+
+
+def to_buckwalter(arabic: str) -> str:
+    return arabic.translate(_TO_BUCKWALTER)
+
+
+def romanize(buckwalter: str) -> str:
+    """Lower-case ASCII rendering of a Buckwalter name, for fuzzy matching typed spellings."""
+    return buckwalter.translate(_TO_ROMAN).lower()
+
+
+def normalize(arabic: str) -> str:
+    """Strips diacritics / tatweel and unifies hamza, alif, alif maqsura and ta marbuta."""
+    return arabic.translate(_NORMALIZE)
+
+
+def is_arabic(text: str) -> bool:
+    return _ARABIC_WORD.search(text) is not None
+
+
+def looks_buckwalter(token: str) -> bool:
+    """
+    True for tokens written in Buckwalter (e.g. 'rHm', '{som', 'raHiym~'): every
+    character is in the Buckwalter alphabet, and the token has a Buckwalter-only
+    symbol or a capital after its first letter without being all capitals.
+    CamelCase names and acronyms (GitHub, McKinsey, USA, DNA) fail one of the two.
+    """
+    if not token or not _BUCKWALTER_ALPHABET.issuperset(token):
+        return False
+    if not _BUCKWALTER_SYMBOLS.isdisjoint(token):
+        return True
+    return not _BUCKWALTER_CAPITALS.isdisjoint(token[1:]) and not token.isupper()
+
+
+def _local_name(uri, namespace) -> str:
+    s = str(uri)
+    return s[len(str(namespace)):] if s.startswith(str(namespace)) else s.split('/')[-1]
+
+
+def _arabic_labels(graph) -> frozenset:
+    """(node, text) for every Arabic rdfs:label on a root or lemma node."""
+    from rdflib.namespace import RDFS
+    root, lemma = str(ROOT), str(LEMMA)
+    return frozenset((node, str(label)) for node, label in graph.subject_objects(RDFS.label)
+                     if str(node).startswith((root, lemma)) and is_arabic(str(label)))
+
+
+class SurfaceIndex:
+    """
+    Normalized Arabic surface form -> roots (Buckwalter names, most frequent first).
+
+    Keys come from every root name and lemma name in the root index
+    (transliterated to Arabic and normalized) and from Arabic rdfs:label
+    literals on root / lemma nodes when the graph carries them. Buckwalter
+    input is transliterated into the same key space, so one dictionary
+    serves both scripts.
+    """
+
+    def __init__(self, forms: Optional[Dict[str, Tuple[str, ...]]] = None, roots: Iterable[str] = ()):
+        self.forms: Dict[str, Tuple[str, ...]] = forms or {}
+        self.roots: Set[str] = set(roots)
+        self.root_index: Optional[RootIndex] = None
+        self.labels_hash: Optional[int] = None
+
+    @classmethod
+    def build(cls, root_index: RootIndex, graph=None) -> "SurfaceIndex":
+        counts: Dict[str, Counter] = {}
+
+        def add(form: str, root: str, weight: int = 1):
+            key = normalize(form)
+            if key:
+                counts.setdefault(key, Counter())[root] += weight
+
+        for root, bucket in root_index.by_root.items():
+            add(to_arabic(root), root, len(bucket))
+
+        lemma_roots: Dict = {}
+        for seg, lemma in root_index.seg_lemma.items():
+            for r in root_index.seg_roots.get(seg, ()):
+                lemma_roots.setdefault(lemma, Counter())[root_name(r)] += 1
+        for lemma, roots in lemma_roots.items():
+            for root, n in roots.items():
+                add(to_arabic(_local_name(lemma, LEMMA)), root, n)
+
+        labels = _arabic_labels(graph) if graph is not None else frozenset()
+        for node, text in labels:
+            node_s = str(node)
+            if node_s.startswith(str(ROOT)):
+                add(text, root_name(node))
+            elif node in lemma_roots:
+                for root, n in lemma_roots[node].items():
+                    add(text, root, n)
+
+        forms = {k: tuple(r for r, _ in c.most_common()) for k, c in counts.items()}
+        index = cls(forms, root_index.by_root.keys())
+        index.root_index, index.labels_hash = root_index, hash(labels)
+        logger.info(f"Surface index built: {len(forms):,} forms -> {len(index.roots):,} roots.")
+        return index
+
+    def updated(self, root_index: RootIndex, graph) -> "SurfaceIndex":
+        """
+        This index when it was built from `root_index` and the graph's Arabic
+        labels are unchanged (RootIndex.updated returns the same object for
+        an unchanged graph); otherwise a fresh build.
+        """
+        if root_index is self.root_index and hash(_arabic_labels(graph)) == self.labels_hash:
+            return self
+        return self.build(root_index, graph)
+
+    def resolve_word(self, word: str) -> Tuple[str, ...]:
+        """Roots for one Arabic-script word, trying common proclitics when the bare form misses."""
+        key = normalize(word)
+        hit = self.forms.get(key)
+        if hit:
+            return hit
+        for prefix in _PREFIXES:
+            if key.startswith(prefix) and len(key) - len(prefix) >= 2:
+                hit = self.forms.get(key[len(prefix):])
+                if hit:
+                    return hit
+        return ()
+
+    def resolve_token(self, token: str) -> Tuple[str, ...]:
+        """Roots for a root name, Buckwalter transliteration or Arabic word."""
+        if token in self.roots:
+            return (token,)
+        if is_arabic(token):
+            return self.resolve_word(token)
+        return self.resolve_word(to_arabic(token))
+
+    def lookup(self, query: str, max_terms: int = 5) -> List[Tuple[str, str]]:
+        """
+        (term, root) pairs for the Arabic words of a query and for tokens that are
+        unambiguously transliterations: root:/lemma: references, exact root names,
+        or words carrying Buckwalter-only characters. Plain English words are
+        never transliterated.
+        """
+        pairs: List[Tuple[str, str]] = []
+        seen: Set[str] = set()
+        terms = _ARABIC_WORD.findall(query)
+        for raw in query.split():
+            token = raw.strip(_EDGE_PUNCT)
+            explicit = token.lower().startswith(("root:", "lemma:"))
+            if explicit:
+                token = token.split(":", 1)[1]
+            if token and not is_arabic(token) and (explicit or token in self.roots or looks_buckwalter(token)):
+                terms.append(token)
+        for term in terms:
+            if term in seen:
+                continue
+            seen.add(term)
+            roots = self.resolve_token(term)
+            if roots:
+                pairs.append((term, roots[0]))
+                if len(pairs) >= max_terms:
+                    break
+        return pairs
+
+    def __len__(self) -> int:
+        return len(self.forms)
@@ -0,0 +1,166 @@
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from qusai_core.ontology.arabic import romanize
+from qusai_core.ontology.index import root_name
+from qusai_core.utils.constants import LEMMA
+from qusai_core.utils.fuzzy import FuzzyIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCEPT_MAP_PATH = Path(__file__).parent.parent / "utils" / "concept_mapping.json"
+
+
+class ConceptBridge:
+    """
+    The Static Bridge: English concept -> Arabic Root (Buckwalter).
+    Immutable once built so a reload can swap it atomically.
+    """
+
+    def __init__(self, concept_map: Optional[Dict[str, str]] = None):
+        self.concept_map: Dict[str, str] = dict(concept_map or {})
+
+    @classmethod
+    def from_file(cls, path: Path = DEFAULT_CONCEPT_MAP_PATH) -> "ConceptBridge":
+        concept_map = {}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    concept_map = json.load(f)
+                logger.info(f"Loaded {len(concept_map)} concept mappings.")
+            except Exception as e:
+                logger.error(f"Failed to load concept mapping: {e}")
+        return cls(concept_map)
+
+    @staticmethod
+    def keywords(query: str, max_keywords: Optional[int] = None) -> List[str]:
+        """Lower-cased words longer than 3 characters (the Bridge's keyword rule)."""
+        words = [w.lower() for w in query.split() if len(w) > 3]
+        return words[:max_keywords] if max_keywords is not None else words
+
+    def map_keywords(self, query: str, max_keywords: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Returns [(keyword, root), ...] for every keyword present in the map."""
+        return [(kw, self.concept_map[kw]) for kw in self.keywords(query, max_keywords) if kw in self.concept_map]
+
+    def diff(self, other: "ConceptBridge") -> Tuple[Set[str], Set[str]]:
+        """
+        Compares two bridges.
+        Returns (changed_keys, affected_roots): keys added, removed or remapped,
+        and every root value on either side of those changes.
+        """
+        changed_keys: Set[str] = set()
+        affected_roots: Set[str] = set()
+        for key in self.concept_map.keys() | other.concept_map.keys():
+            old, new = self.concept_map.get(key), other.concept_map.get(key)
+            if old != new:
+                changed_keys.add(key)
+                affected_roots.update(r for r in (old, new) if r)
+        return changed_keys, affected_roots
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.concept_map
+
+    def __len__(self) -> int:
+        return len(self.concept_map)
+
+
+_STOPWORDS = frozenset("""
+a about after again all also and any are because been before being both but can could did does
+doing done each even ever every for from get give given goes going got had has have having her
+here hers him his how into its just let like made make many may more most much must not now off
+often once one only other our out over own same say says see she should show since some such
+than that the their them then there these they thing this those though through tell told too
+under until upon use very want was way well were what when where which while who whom whose
+why will with within without would yet you your
+""".split())
+_EDGE_PUNCT = ",.;:!?\"'()[]"
+
+
+class ConceptCorrector:
+    """
+    Spelling-tolerant fallback for the Static Bridge ("jin" -> jinn, "mercey"
+    -> mercy, "rizk" -> lemma rizoq). A FuzzyIndex over every concept_map key
+    plus the romanized lemma names of the ontology, built once per snapshot.
+    Concept keys are added first, so they win ties.
+
+    Only the shapes of a misspelling are accepted: a three-letter word may
+    only grow ("jin" -> jinn), and a word that is a known term plus a tail
+    ("hello", "hells", "angels") is a different word, not a typo. Concept
+    keys are English, so a short word one edit from one is usually another
+    English word (deal/dead, kind/king): they are corrected from
+    CONCEPT_MIN_LENGTH letters, romanized lemmas from four. Bare root names
+    are not indexed; three consonants match too much English. Matches are
+    approximate by nature: the engine ranks them as QIYAS, never HAQQ.
+    """
+
+    CONCEPT_MIN_LENGTH = 6
+    MAX_EDIT_RATIO = 0.25
+
+    def __init__(self, index: Optional[FuzzyIndex] = None):
+        self.index = index or FuzzyIndex()
+
+    @classmethod
+    def build(cls, bridge: ConceptBridge, root_index=None) -> "ConceptCorrector":
+        index = FuzzyIndex()
+        for key, root in bridge.concept_map.items():
+            index.add(key.lower(), (root, "concept", key))
+
+        if root_index is not None:
+            lemma_roots: Dict = {}
+            for seg, lemma in root_index.seg_lemma.items():
+                for r in root_index.seg_roots.get(seg, ()):
+                    lemma_roots.setdefault(lemma, Counter())[root_name(r)] += 1
+            for lemma, roots in lemma_roots.items():
+                s = str(lemma)
+                name = s[len(str(LEMMA)):] if s.startswith(str(LEMMA)) else s.split('/')[-1]
+                if len(romanize(name)) >= 3:
+                    index.add(romanize(name), (roots.most_common(1)[0][0], "lemma", name))
+
+        logger.info(f"Concept corrector built: {len(index):,} terms.")
+        return cls(index)
+
+    @classmethod
+    def max_distance(cls, word: str) -> int:
+        """One edit up to seven letters, two from eight (the index holds at most two)."""
+        return max(1, min(2, int(len(word) * cls.MAX_EDIT_RATIO)))
+
+    def correct(self, query: str, max_keywords: int = 5) -> List[Tuple[str, str, str, int]]:
+        """
+        Returns [(word, matched_label, root, distance), ...] for query words of
+        three or more letters within the edit bound of a concept key or lemma.
+        Distance 0 means the word is a romanized lemma name as typed (a match,
+        not a correction); exact concept keys are left to the Bridge.
+        """
+        out: List[Tuple[str, str, str, int]] = []
+        seen: Set[str] = set()
+        for raw in query.split():
+            word = raw.strip(_EDGE_PUNCT).lower()
+            if len(word) < 3 or not word.isascii() or not word.isalpha() or word in _STOPWORDS or word in seen:
+                continue
+            seen.add(word)
+            hit = self.index.lookup(word, self.max_distance(word), same_initial=True)
+            if hit is None:
+                continue
+            term, (root, source, label), dist = hit
+            # Exact concept keys are the Bridge's call (it skips short words on purpose)
+            if dist == 0:
+                if source == "concept":
+                    continue
+            # Three-letter words only grow ("jin" -> jinn): swaps there are mostly other real words
+            elif len(word) == 3:
+                if len(term) <= 3:
+                    continue
+            elif len(word) > len(term) and word.startswith(term):
+                continue  # a known term plus a tail: hello, hells, angels
+            elif source == "concept" and len(word) < self.CONCEPT_MIN_LENGTH:
+                continue
+            out.append((word, label, root, dist))
+            if len(out) >= max_keywords:
+                break
+        return out
+
+    def __len__(self) -> int:
+        return len(self.index)
@@ -0,0 +1,145 @@
+import json
+import logging
+import math
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from qusai_core.ontology.index import RootIndex, root_name, segment_verse
+from qusai_core.ontology.snapshot import artifact_dir, publish_artifact, read_meta, write_meta
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_NAME = "cooccurrence"
+FORMAT_VERSION = 1
+
+
+class CooccurrenceMatrix:
+    """
+    Sparse root x root co-occurrence at verse level, weighted by positive PMI:
+
+        PMI(a, b) = log( N * c(a, b) / (c(a) * c(b)) )
+
+    where N is the number of verses, c(x) the verses containing root x and
+    c(a, b) the verses containing both. Stored as CSR (indptr / indices /
+    data) with each row pre-sorted by descending PMI and capped, so the
+    top-N related roots of a root is a single array slice.
+    """
+
+    def __init__(self, roots: List[str], indptr: np.ndarray, indices: np.ndarray, data: np.ndarray):
+        self.roots = roots
+        self.root_ids: Dict[str, int] = {r: i for i, r in enumerate(roots)}
+        # Plain ndarray views (still file-backed when memory-mapped): slicing a
+        # np.memmap subclass costs several times more per call
+        self.indptr = np.asarray(indptr)
+        self.indices = np.asarray(indices)
+        self.data = np.asarray(data)
+
+    @classmethod
+    def build(cls, root_index: RootIndex, min_count: int = 2, max_per_row: int = 64) -> "CooccurrenceMatrix":
+        roots = sorted(root_index.by_root)
+        ids = {r: i for i, r in enumerate(roots)}
+
+        verses: Dict[Tuple[int, int], Set[int]] = {}
+        for seg, seg_roots in root_index.seg_roots.items():
+            verse = segment_verse(seg)
+            if verse is None:
+                continue
+            bucket = verses.setdefault(verse, set())
+            for r in seg_roots:
+                rid = ids.get(root_name(r))
+                if rid is not None:
+                    bucket.add(rid)
+
+        n_verses = len(verses)
+        df = np.zeros(len(roots), dtype=np.float64)
+        pairs: Counter = Counter()
+        for rids in verses.values():
+            ordered = sorted(rids)
+            df[ordered] += 1
+            pairs.update(combinations(ordered, 2))
+
+        rows: List[List[Tuple[float, int]]] = [[] for _ in roots]
+        for (a, b), c in pairs.items():
+            if c < min_count:
+                continue
+            pmi = math.log(n_verses * c / (df[a] * df[b]))
+            if pmi <= 0:
+                continue
+            rows[a].append((pmi, b))
+            rows[b].append((pmi, a))
+
+        indptr = np.zeros(len(roots) + 1, dtype=np.int64)
+        indices: List[int] = []
+        data: List[float] = []
+        for i, row in enumerate(rows):
+            row.sort(key=lambda t: (-t[0], t[1]))
+            row = row[:max_per_row]
+            indices.extend(j for _, j in row)
+            data.extend(p for p, _ in row)
+            indptr[i + 1] = len(indices)
+
+        matrix = cls(roots, indptr, np.asarray(indices, dtype=np.int32), np.asarray(data, dtype=np.float32))
+        logger.info(f"Co-occurrence matrix: {len(roots):,} roots, {n_verses:,} verses, {len(indices):,} entries.")
+        return matrix
+
+    def related(self, root: str, n: int = 5) -> List[Tuple[str, float]]:
+        """Top-n roots sharing verses with `root`, by PMI. Empty if unknown."""
+        rid = self.root_ids.get(root)
+        if rid is None:
+            return []
+        start, stop = self.indptr[rid:rid + 2].tolist()
+        end = min(stop, start + n)
+        return [(self.roots[j], p) for j, p in zip(self.indices[start:end].tolist(), self.data[start:end].tolist())]
+
+    # ------------------------------------------------------------------
+    # Persistence (memory-mapped .npy arrays, one directory per ontology version)
+    # ------------------------------------------------------------------
+    def save(self, snapshot_dir: Path, fingerprint: str) -> Path:
+        """Publishes a new version directory; never rewrites files a live matrix may map."""
+        def write(out: Path):
+            np.save(out / "indptr.npy", np.asarray(self.indptr))
+            np.save(out / "indices.npy", np.asarray(self.indices))
+            np.save(out / "data.npy", np.asarray(self.data))
+            with open(out / "roots.json", "w", encoding="utf-8") as f:
+                json.dump(self.roots, f, ensure_ascii=False)
+            # meta.json last: its presence marks a complete artifact
+            write_meta(out, {"fingerprint": fingerprint, "format": FORMAT_VERSION})
+        return publish_artifact(snapshot_dir, ARTIFACT_NAME, fingerprint, write)
+
+    @classmethod
+    def load(cls, snapshot_dir: Path, fingerprint: str) -> Optional["CooccurrenceMatrix"]:
+        src = artifact_dir(snapshot_dir, ARTIFACT_NAME, fingerprint)
+        meta = read_meta(src)
+        if meta.get("fingerprint") != fingerprint or meta.get("format") != FORMAT_VERSION:
+            return None
+        try:
+            with open(src / "roots.json", "r", encoding="utf-8") as f:
+                roots = json.load(f)
+            return cls(roots,
+                       np.load(src / "indptr.npy", mmap_mode="r"),
+                       np.load(src / "indices.npy", mmap_mode="r"),
+                       np.load(src / "data.npy", mmap_mode="r"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable co-occurrence artifact: {e}")
+            return None
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+def load_or_build(root_index: RootIndex, snapshot_dir: Path, fingerprint: str) -> CooccurrenceMatrix:
+    """Memory-maps the persisted matrix for this ontology version, building it if absent."""
+    matrix = CooccurrenceMatrix.load(snapshot_dir, fingerprint)
+    if matrix is not None:
+        logger.info(f"Co-occurrence matrix mapped from {snapshot_dir}.")
+        return matrix
+    matrix = CooccurrenceMatrix.build(root_index)
+    try:
+        matrix.save(snapshot_dir, fingerprint)
+    except OSError as e:
+        logger.warning(f"Could not persist co-occurrence matrix ({e}); keeping it in memory.")
+    return matrix
@@ -0,0 +1,156 @@
+import argparse
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_ONNX_DIR = Path(os.environ.get("QUSAI_ONNX_DIR", Path.home() / ".cache" / "qusai" / "minilm-l6-int8"))
+ONNX_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+# all-MiniLM-L6-v2 truncates at 256 word pieces
+MAX_SEQ_LENGTH = 256
+
+# Third-party packages each backend imports at runtime
+BACKEND_MODULES = {"torch": ("sentence_transformers",), "onnx": ("onnxruntime", "tokenizers")}
+
+
+class SentenceTransformerEncoder:
+    """Full-precision PyTorch backend (the original Resonance encoder)."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts), dtype=np.float32)
+
+
+class OnnxEncoder:
+    """
+    Int8-quantized ONNX backend.
+    Needs only onnxruntime + tokenizers at runtime (no torch), and reproduces
+    the sentence-transformers pipeline: mean pooling over the attention mask
+    followed by L2 normalization.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: Path = DEFAULT_ONNX_DIR, threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        self.model_path = model_dir / ONNX_MODEL_FILE
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(self.model_path), options,
+                                            providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+def onnx_artifacts_exist(model_dir: Path = DEFAULT_ONNX_DIR) -> bool:
+    model_dir = Path(model_dir)
+    return (model_dir / ONNX_MODEL_FILE).exists() and (model_dir / TOKENIZER_FILE).exists()
+
+
+def export_onnx_int8(model_dir: Path = DEFAULT_ONNX_DIR, model_name: str = DEFAULT_MODEL_NAME) -> Path:
+    """
+    One-time export: transformer -> ONNX (fp32) -> dynamic int8 quantization.
+    Needs torch + transformers + onnx + onnxruntime (the optional export block
+    in requirements.txt); the runtime encoder afterwards needs none but the last.
+    Run it as a build step, never from serving:
+
+        python -m qusai_core.ontology.encoders --export
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = model_dir / "model_fp32.onnx"
+
+    logger.info(f"Exporting {model_name} to ONNX at {model_dir}...")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {n: {0: "batch", 1: "sequence"} for n in names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[n] for n in names),
+            str(fp32_path),
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    quantize_dynamic(str(fp32_path), str(model_dir / ONNX_MODEL_FILE), weight_type=QuantType.QInt8)
+    fp32_path.unlink(missing_ok=True)
+    tokenizer.backend_tokenizer.save(str(model_dir / TOKENIZER_FILE))
+    logger.info(f"✓ Int8 ONNX encoder written to {model_dir}")
+    return model_dir
+
+
+def create_encoder(backend: str = "torch", onnx_dir: Optional[Path] = None):
+    """Builds the requested encoder backend ('torch' or 'onnx')."""
+    if backend == "onnx":
+        onnx_dir = Path(onnx_dir or DEFAULT_ONNX_DIR)
+        if not onnx_artifacts_exist(onnx_dir):
+            raise FileNotFoundError(f"No int8 ONNX encoder in {onnx_dir}; build it with "
+                                    f"`python -m qusai_core.ontology.encoders --export --model-dir {onnx_dir}`")
+        return OnnxEncoder(onnx_dir)
+    if backend == "torch":
+        return SentenceTransformerEncoder()
+    raise ValueError(f"Unknown resonance backend: {backend}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the int8 ONNX resonance encoder.")
+    parser.add_argument("--export", action="store_true", help="Export and quantize the model")
+    parser.add_argument("--model-dir", type=Path, default=DEFAULT_ONNX_DIR)
+    parser.add_argument("--model-name", default=DEFAULT_MODEL_NAME)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if not args.export:
+        state = "present" if onnx_artifacts_exist(args.model_dir) else "missing (run with --export)"
+        print(f"ONNX encoder in {args.model_dir}: {state}")
+        return
+    export_onnx_int8(args.model_dir, args.model_name)
+
+
+if __name__ == "__main__":
+    main()
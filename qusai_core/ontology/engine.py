@@ -1,26 +1,26 @@
 import json
 import logging
+import threading
 from pathlib import Path
-from functools import lru_cache
-from typing import List, Dict, Optional, Set, Tuple
-
-import rdflib
-from rdflib import Graph, Literal
+from typing import TYPE_CHECKING, List, Dict, Optional, Set, Tuple
 
 from qusai_core.utils.constants import (
     ALIGN, QURAN, ROOT, LEMMA, 
     DEFAULT_ONTOLOGY_PATH, DEFAULT_GRAMMAR_PATH
 )
+from qusai_core.utils.cache import LRUCache
+from qusai_core.utils.memory import (
+    MemoryTracker, deep_sizeof, estimate_graph_bytes, estimate_model_bytes, estimate_ttl_graph_bytes,
+    merge_report, preload_rdflib
+)
+from qusai_core.ontology.bridge import ConceptBridge, ConceptCorrector, DEFAULT_CONCEPT_MAP_PATH
+from qusai_core.ontology.index import RootIndex, shorten_uri
+from qusai_core.ontology.arabic import SurfaceIndex, to_arabic
+from qusai_core.ontology.snapshot import OntologySnapshot, snapshot_dir, graph_fingerprint
+from qusai_core.ontology.resonance import ResonanceEngine, ARCHETYPAL_ROOTS
 
-logger = logging.getLogger(__name__)
-
-class OntologyEngine:
-    """
-    Core engine for interacting with the Quranic Root Ontology (v3).
-    Handles loading, querying, and context extraction.
-    """
-    
-from qusai_core.ontology.resonance import ResonanceEngine
+if TYPE_CHECKING:
+    from rdflib import Graph
 
 logger = logging.getLogger(__name__)
 
@@ -30,24 +30,56 @@ class OntologyEngine:
     Handles loading, querying, and context extraction.
     """
     
-    def __init__(self, ontology_path: Optional[Path] = None, grammar_path: Optional[Path] = None):
+    def __init__(self, ontology_path: Optional[Path] = None, grammar_path: Optional[Path] = None,
+                 concept_map_path: Optional[Path] = None,
+                 resonance_backend: Optional[str] = None):
         self.ontology_path = ontology_path or DEFAULT_ONTOLOGY_PATH
         self.grammar_path = grammar_path or DEFAULT_GRAMMAR_PATH
-        self.graph: Optional[Graph] = None
+        self.concept_map_path = concept_map_path or DEFAULT_CONCEPT_MAP_PATH
         self.grammar_rules: List[Dict] = []
-        self.concept_map: Dict[str, str] = {}
         self.resonance = ResonanceEngine() # The Quantum Compass
+        self.resonance_backend = resonance_backend
         self._is_loaded = False
-        
-        # Load Concept Mapping
-        mapping_path = Path(__file__).parent.parent / "utils" / "concept_mapping.json"
-        if mapping_path.exists():
-            try:
-                with open(mapping_path, 'r', encoding='utf-8') as f:
-                    self.concept_map = json.load(f)
-                logger.info(f"Loaded {len(self.concept_map)} concept mappings.")
-            except Exception as e:
-                logger.error(f"Failed to load concept mapping: {e}")
+
+        # Graph, indexes and bridge live in one snapshot that reloads swap atomically
+        self._snapshot = OntologySnapshot(bridge=ConceptBridge.from_file(self.concept_map_path))
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+        # get_context cache: (query, limit, related, verses, neighbours) -> (version, roots, keywords, text)
+        self._context_cache = LRUCache(maxsize=128)
+        self._sparql = None
+        self.memory = MemoryTracker()
+
+    @property
+    def snapshot(self) -> OntologySnapshot:
+        """The current ontology version. Take it once and pass it along to stay consistent."""
+        return self._snapshot
+
+    @property
+    def graph(self) -> Optional["Graph"]:
+        return self._snapshot.graph
+
+    @property
+    def concept_map(self) -> Dict[str, str]:
+        return self._snapshot.bridge.concept_map
+
+    def start_memory_tracking(self):
+        """
+        Starts tracing load-time allocations per component. rdflib, the
+        numpy-backed indexes and the embedding backend are imported first,
+        so module import cost is not booked to the graph or the model.
+        """
+        preload_rdflib()
+        from qusai_core.ontology import cooccurrence, verses  # noqa: F401
+        self.resonance.preload(self.resonance_backend)
+        self.memory.start()
+
+    def projected_load_bytes(self) -> int:
+        """Size the graph and its derived indexes will take, projected from the TTL file alone."""
+        if not self.ontology_path.exists():
+            return 0
+        return estimate_ttl_graph_bytes(self.ontology_path, with_indexes=True)
 
     def load(self):
         """Loads the RDF graph, grammar rules, and Vector Engine."""
@@ -57,7 +89,7 @@ class OntologyEngine:
         # Load Grammar Rules
         if self.grammar_path.exists():
             try:
-                with open(self.grammar_path, 'r', encoding='utf-8') as f:
+                with self.memory.track("grammar_rules"), open(self.grammar_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     self.grammar_rules = data if isinstance(data, list) else data.get('rules', [])
                 logger.info(f"Loaded {len(self.grammar_rules)} grammar rules.")
@@ -65,55 +97,209 @@ class OntologyEngine:
                 logger.error(f"Failed to load grammar rules: {e}")
 
         # Load Resonance Engine
-        self.resonance.load()
+        with self.memory.track("embedding_model"):
+            self.resonance.load(backend=self.resonance_backend)
 
         # Load RDF Graph
         if self.ontology_path.exists():
-            logger.info(f"Loading ontology from {self.ontology_path}...")
-            self.graph = rdflib.Graph()
-            self.graph.bind("align", ALIGN)
-            self.graph.bind("quran", QURAN)
-            self.graph.bind("root", ROOT)
-            self.graph.bind("lemma", LEMMA)
-            try:
-                self.graph.parse(str(self.ontology_path), format="turtle")
-                logger.info(f"Loaded {len(self.graph):,} triples.")
-                self._is_loaded = True
-            except Exception as e:
-                logger.error(f"Failed to parse ontology: {e}")
-                raise
+            with self.memory.track("graph"):
+                graph = self._parse_graph()
+            with self.memory.track("root_index"):
+                root_index = RootIndex.build(graph)
+            with self.memory.track("cooccurrence"):
+                cooc = self._load_cooccurrence(root_index)
+            with self.memory.track("verse_table"):
+                verse_table = self._load_verses(root_index)
+            with self.memory.track("surface_index"):
+                surface = SurfaceIndex.build(root_index, graph)
+            with self.memory.track("concept_corrector"):
+                corrector = ConceptCorrector.build(self._snapshot.bridge, root_index)
+            snapshot = self._snapshot.evolve(graph=graph, root_index=root_index, cooccurrence=cooc,
+                                             verses=verse_table, surface=surface, corrector=corrector)
+            with self._swap_lock:
+                self._snapshot = snapshot
+                self._context_cache.clear()
+            self._is_loaded = True
         else:
             logger.error(f"Ontology file not found: {self.ontology_path}")
 
+    def _parse_graph(self) -> "Graph":
+        # rdflib is only needed once there is a graph to parse
+        import rdflib
+        logger.info(f"Loading ontology from {self.ontology_path}...")
+        graph = rdflib.Graph()
+        graph.bind("align", ALIGN)
+        graph.bind("quran", QURAN)
+        graph.bind("root", ROOT)
+        graph.bind("lemma", LEMMA)
+        try:
+            graph.parse(str(self.ontology_path), format="turtle")
+            logger.info(f"Loaded {len(graph):,} triples.")
+        except Exception as e:
+            logger.error(f"Failed to parse ontology: {e}")
+            raise
+        return graph
+
+    def _load_cooccurrence(self, root_index: RootIndex):
+        """Maps the persisted root co-occurrence matrix for this TTL version, or builds it."""
+        from qusai_core.ontology import cooccurrence
+        try:
+            return cooccurrence.load_or_build(root_index, snapshot_dir(self.ontology_path),
+                                              graph_fingerprint(self.ontology_path))
+        except Exception as e:
+            logger.error(f"Failed to prepare co-occurrence matrix: {e}")
+            return None
+
+    def _load_verses(self, root_index: RootIndex):
+        """Maps the persisted verse table for this TTL version, or builds it."""
+        from qusai_core.ontology import verses
+        try:
+            return verses.load_or_build(root_index, snapshot_dir(self.ontology_path),
+                                        graph_fingerprint(self.ontology_path))
+        except Exception as e:
+            logger.error(f"Failed to prepare verse table: {e}")
+            return None
+
+    def reload(self, ontology: bool = True, concepts: bool = True) -> Dict:
+        """
+        Rebuilds graph, indexes and bridge off to the side, then swaps them in.
+        Requests already running keep the snapshot they started with; only
+        cached contexts that touch a changed root or keyword are invalidated.
+        """
+        with self._reload_lock:
+            old = self._snapshot
+            changes = {}
+            changed_keys: Set[str] = set()
+            affected_roots: Set[str] = set()
+
+            if concepts:
+                bridge = ConceptBridge.from_file(self.concept_map_path)
+                changed_keys, bridge_roots = old.bridge.diff(bridge)
+                affected_roots |= bridge_roots
+                changes["bridge"] = bridge
+
+            if ontology and self.ontology_path.exists():
+                graph = self._parse_graph()
+                root_index, index_roots = old.root_index.updated(graph)
+                affected_roots |= index_roots
+                changes["graph"] = graph
+                changes["root_index"] = root_index
+                changes["cooccurrence"] = self._load_cooccurrence(root_index) if index_roots else old.cooccurrence
+                # updated() hands back the old index when no segment changed; lemma-only
+                # edits on rootless segments still produce a new one and reach the verses
+                index_changed = root_index is not old.root_index
+                changes["verses"] = self._load_verses(root_index) if index_changed else old.verses
+                changes["surface"] = old.surface.updated(root_index, graph)
+
+            if changed_keys or changes.get("root_index", old.root_index) is not old.root_index:
+                changes["corrector"] = ConceptCorrector.build(changes.get("bridge", old.bridge),
+                                                              changes.get("root_index", old.root_index))
+
+            new = old.evolve(**changes)
+            with self._swap_lock:
+                self._snapshot = new
+                cooc_changed = new.cooccurrence is not old.cooccurrence
+                verses_changed = new.verses is not old.verses
+                surface_changed = new.surface is not old.surface
+                corrector_changed = new.corrector is not old.corrector
+                dropped = self._context_cache.invalidate(
+                    lambda key, entry: bool(entry[1] & affected_roots) or bool(entry[2] & changed_keys)
+                    or (cooc_changed and key[2] > 0) or (verses_changed and key[3])
+                    or (surface_changed and old.surface.lookup(key[0]) != new.surface.lookup(key[0]))
+                    or (corrector_changed and old.corrector.correct(key[0]) != new.corrector.correct(key[0]))
+                )
+                # Survivors are still correct for the new version
+                self._context_cache.update_values(lambda key, entry: (new.version,) + entry[1:])
+            if new.graph is not None:
+                self._is_loaded = True
+
+        summary = {
+            "version": new.version,
+            "changed_keys": len(changed_keys),
+            "affected_roots": len(affected_roots),
+            "invalidated_contexts": dropped,
+        }
+        logger.info(f"[RELOAD] Ontology snapshot swapped: {summary}")
+        return summary
+
+    def reload_async(self, ontology: bool = True, concepts: bool = True) -> threading.Thread:
+        """Runs reload() on a background thread."""
+        thread = threading.Thread(target=self.reload, args=(ontology, concepts),
+                                  name="ontology-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def watch(self, interval: float = 2.0):
+        """Starts a file watcher that hot-reloads on ontology / concept map edits."""
+        from qusai_core.ontology.reload import OntologyWatcher
+        watcher = OntologyWatcher(self, interval=interval)
+        watcher.start()
+        return watcher
+
     def is_ready(self) -> bool:
         return self._is_loaded and self.graph is not None
 
-    def analyze_resonance(self, query: str) -> Tuple[str, str, List[Dict[str, str]]]:
+    def analyze_resonance(self, query: str,
+                          snapshot: Optional[OntologySnapshot] = None) -> Tuple[str, str, List[Dict[str, str]]]:
         """
         Quantum Ontology Check:
         Determines if the query hits a 'Solid Node' (Haqq) or requires 'Analogy' (Qiyas).
         Returns: (Mode, Explanation, Root_Objects)
         """
-        if not self.is_ready():
+        snap = snapshot or self._snapshot
+        if not self._is_loaded or snap.graph is None:
             return "SILENCE", "Ontology not loaded", []
 
-        # 1. Direct Root Search (Explicit Arabic terms)
-        if any("root:" in w.lower() for w in query.split()):
-             return "HAQQ", "Direct Root Reference detected.", [{"root": "User-Specified", "definition": "Explicit User Command"}]
+        # 1. Direct Root Search (Explicit Arabic terms), resolved against the ontology
+        explicit = [w.split(":", 1)[1] for w in query.split() if w.lower().startswith("root:")]
+        if explicit:
+            resolved = []
+            for term in explicit:
+                roots = snap.surface.resolve_token(term.strip(",.;:!?\"()[]"))
+                if roots:
+                    resolved.append({"root": roots[0], "definition": f"Explicit Root Reference ({term})",
+                                     "buckwalter": roots[0], "arabic": to_arabic(roots[0])})
+            if resolved:
+                return "HAQQ", "Direct Root Reference detected.", resolved
 
         # 2. Bridge Search (Hard-coded Map)
-        keywords = [w.lower() for w in query.split() if len(w) > 3]
-        mapped_roots = []
-        for kw in keywords:
-            if kw in self.concept_map:
-                mapped_roots.append({"root": self.concept_map[kw], "definition": "Mapped via Static Bridge"})
+        mapped_roots = [
+            {"root": root, "definition": "Mapped via Static Bridge"}
+            for kw, root in snap.bridge.map_keywords(query)
+        ]
         
         if mapped_roots:
              return "HAQQ", "Concept explicitly mapped in Bridge.", mapped_roots
 
-        # 3. Vector Resonance (The Quantum Fallback)
+        # 3. Surface Forms (Arabic script / Buckwalter), hash lookups only
+        surface_roots = [
+            {"root": root, "definition": f"Surface form '{term}' in Ontology",
+             "buckwalter": root, "arabic": to_arabic(root)}
+            for term, root in snap.surface.lookup(query)
+        ]
+
+        if surface_roots:
+             return "HAQQ", "Arabic surface form resolved in Ontology.", surface_roots
+
+        # 3b. Approximate Concepts (romanized lemma names / bounded spelling correction).
+        # Guesses, not references: QIYAS at most, and no vector fallback needed.
+        approximate = snap.corrector.correct(query)
+        if approximate:
+            root_objects = []
+            notes = []
+            for w, t, root, d in approximate:
+                if d:
+                    notes.append(f"spelling {w}→{t} (d={d})")
+                    definition = f"Approximate Bridge match after spelling correction ({w}→{t})"
+                else:
+                    notes.append(f"romanized {w}={t}")
+                    definition = f"Approximate match on romanized Ontology name ({w}={t})"
+                root_objects.append({"root": root, "definition": definition, "approximate": True})
+            return "QIYAS", f"Approximate concept match: {', '.join(notes)}.", root_objects
+
+        # 4. Vector Resonance (The Quantum Fallback)
         top_matches = self.resonance.get_resonance(query, top_k=2)
-        
+
         if not top_matches:
             return "SILENCE", "No resonance signal found.", []
             
@@ -123,7 +309,8 @@ class OntologyEngine:
         
         root_objects = []
         for r, s, d in top_matches:
-            root_objects.append({"root": r, "definition": d})
+            root_objects.append({"root": r, "definition": d,
+                                 "buckwalter": ARCHETYPAL_ROOTS.get(r, {}).get("buckwalter", r)})
         
         confidence = self.resonance.interpret_score(score)
         explanation = f"Vector Resonance: {query} ≈ Root({primary_match[0]}) [Score: {score:.2f}]"
@@ -135,66 +322,86 @@ class OntologyEngine:
         else:
             return "QIYAS", f"{explanation} (Weak Signal)", root_objects
 
-    @lru_cache(maxsize=128)
-    def get_context(self, query: str, limit: int = 15) -> str:
+    def get_context(self, query: str, limit: int = 15,
+                    snapshot: Optional[OntologySnapshot] = None,
+                    related: int = 0,
+                    whole_verses: bool = False,
+                    neighbours: int = 0) -> str:
         """
         Retrieves relevant graph triples based on keywords in the query.
         Uses concept mapping to bridge English terms to Arabic Roots (Buckwalter).
+        related > 0 appends, per mapped root, the roots the Quran pairs it with
+        most often (verse-level PMI), read from the precomputed matrix.
+        whole_verses=True returns up to `limit` complete ayat containing the
+        mapped roots instead of isolated segment lines, each widened by
+        `neighbours` verses either side, read from the verse table.
         """
-        if not self.is_ready():
+        snap = snapshot or self._snapshot
+        if not self._is_loaded or snap.graph is None:
             return ""
-        
-        # 1. Extract Keywords & Map to Roots
-        keywords = [w.lower() for w in query.split() if len(w) > 3][:5]
-        mapped_roots = []
-        for kw in keywords:
-            if kw in self.concept_map:
-                mapped_roots.append(self.concept_map[kw])
+
+        key = (query, limit, related, whole_verses, neighbours)
+        cached = self._context_cache.get(key)
+        if cached is not None and cached[0] == snap.version:
+            return cached[3]
+
+        # 1. Extract Keywords & Map to Roots (English bridge, then Arabic / Buckwalter forms)
+        mapped = snap.bridge.map_keywords(query, max_keywords=5) + snap.surface.lookup(query)
+        if not mapped:
+            mapped = [(w, root) for w, _, root, _ in snap.corrector.correct(query)]
+        mapped_roots = [root for kw, root in mapped]
         
         relevant_triples: Set[str] = set()
         
-        # 2. Priority Search: Look for mapped roots directly
-        for root_val in mapped_roots:
-            # Construct the Root URI
-            root_uri = ROOT[root_val]
-            
-            # Find occurrences of this root (Segments that have this root)
-            # Pattern: ?segment quran:hasRoot root:?root_val
-            for s, p, o in self.graph.triples((None, QURAN.hasRoot, root_uri)):
-                s_short = self._shorten_uri(s)
-                root_short = self._shorten_uri(o)
-                
-                # Get the Lemma if available for this segment to add semantic richness
-                lemma_triples = list(self.graph.triples((s, QURAN.hasLemma, None)))
-                if lemma_triples:
-                    lemma_short = self._shorten_uri(lemma_triples[0][2])
-                    relevant_triples.add(f"{s_short} --[hasRoot]--> {root_short} (Lemma: {lemma_short})")
-                else:
-                    relevant_triples.add(f"{s_short} --[hasRoot]--> {root_short}")
+        if whole_verses and snap.verses is not None:
+            # 2a. Verse Search: anchor ayat per mapped root, plus their neighbours
+            anchors: Dict[int, None] = {}
+            for root_val in mapped_roots:
+                for row in snap.verses.verses_of_root(root_val):
+                    anchors[row] = None
+                    if len(anchors) >= limit:
+                        break
+                if len(anchors) >= limit:
+                    break
+            rows = snap.verses.expand(sorted(anchors), neighbours)
+            context = "\n".join(snap.verses.render(row) for row in rows)
+        else:
+            # 2. Priority Search: precomputed segment lines for each mapped root
+            for root_val in mapped_roots:
+                for line in snap.root_index.lines(root_val):
+                    relevant_triples.add(line)
+                    if len(relevant_triples) >= limit:
+                        break
                 
                 if len(relevant_triples) >= limit:
                     break
-            
-            if len(relevant_triples) >= limit:
-                break
 
-        # 3. Fallback: Keyword Scan (if no roots found or limit not reached)
-        if len(relevant_triples) < limit:
-            remaining_limit = limit - len(relevant_triples)
-            # Naive linear scan for English keywords in string representations (inefficient but distinct from root search)
-            # Only perform if we really need more context and didn't find specific roots
-            pass # Skipping naive scan for performance in this v2 optimization, relying on Mapping.
+            # 3. Fallback: Keyword Scan (if no roots found or limit not reached)
+            # Skipped for performance in the v2 optimization, relying on Mapping.
+
+            context = "\n".join(relevant_triples)
+
+        if related > 0 and snap.cooccurrence is not None:
+            related_lines = []
+            for root_val in dict.fromkeys(mapped_roots):
+                pairs = snap.cooccurrence.related(root_val, related)
+                if pairs:
+                    related_lines.append(
+                        f"root:{root_val} --[coOccursWith]--> " + ", ".join(f"root:{r} (PMI {p:.2f})" for r, p in pairs)
+                    )
+            if related_lines:
+                context = "\n".join(filter(None, [context] + related_lines))
 
-        return "\n".join(relevant_triples)
+        # Only the current version may populate the cache
+        with self._swap_lock:
+            if snap is self._snapshot:
+                keywords = frozenset(snap.bridge.keywords(query, max_keywords=5))
+                self._context_cache.put(key, (snap.version, frozenset(mapped_roots), keywords, context))
+        return context
 
     def _shorten_uri(self, uri) -> str:
         """Helper to make URIs readable in context."""
-        s = str(uri)
-        if str(QURAN) in s: return s.replace(str(QURAN), "quran:")
-        if str(ALIGN) in s: return s.replace(str(ALIGN), "align:")
-        if str(ROOT) in s: return s.replace(str(ROOT), "root:")
-        if str(LEMMA) in s: return s.replace(str(LEMMA), "lemma:")
-        return s.split('/')[-1]
+        return shorten_uri(uri)
 
     def get_root_info(self, root_term: str) -> List[str]:
         """
@@ -204,22 +411,83 @@ class OntologyEngine:
         
         # This assumes root_term matches the label or URI segment
         results = []
+        graph = self.graph
         # Construct a potential URI
         target_uri = ROOT[root_term]
         
         # Find everything about this root
-        for s, p, o in self.graph.triples((target_uri, None, None)):
+        for s, p, o in graph.triples((target_uri, None, None)):
              results.append(f"Root({root_term}) has {self._shorten_uri(p)}: {self._shorten_uri(o)}")
              
         # Find things that link TO this root
-        for s, p, o in self.graph.triples((None, None, target_uri)):
+        for s, p, o in graph.triples((None, None, target_uri)):
              results.append(f"{self._shorten_uri(s)} links to Root({root_term})")
              
         return results
 
+    def related_roots(self, root: str, n: int = 5,
+                      snapshot: Optional[OntologySnapshot] = None) -> List[Tuple[str, float]]:
+        """
+        Top-n roots co-occurring with `root` (Buckwalter) at verse level,
+        ranked by PMI. A slice of the precomputed CSR matrix - no graph access.
+        """
+        snap = snapshot or self._snapshot
+        if snap.cooccurrence is None:
+            return []
+        return snap.cooccurrence.related(root, n)
+
+    def sparql_service(self, **kwargs):
+        """The shared SparqlService (created on first use; kwargs only apply then)."""
+        if self._sparql is None:
+            from qusai_core.ontology.sparql import SparqlService
+            self._sparql = SparqlService(self, **kwargs)
+        return self._sparql
+
+    def sparql(self, query: str, bindings: Optional[Dict] = None,
+               max_rows: Optional[int] = None, timeout: Optional[float] = None) -> Dict:
+        """
+        Runs an ad-hoc SPARQL SELECT/ASK over the current ontology version.
+        Prepared queries and results are cached until the next reload.
+        """
+        if not self.is_ready():
+            raise ValueError("Ontology not loaded")
+        return self.sparql_service().query(query, bindings=bindings, max_rows=max_rows, timeout=timeout)
+
+    def get_memory_stats(self) -> Dict[str, Dict]:
+        """
+        Approximate resident bytes per component: structural estimates merged
+        with tracemalloc deltas recorded during load (when tracking was on).
+        Objects shared between components (root names, bridge entries) are
+        counted once, under the first component listed that reaches them.
+        """
+        snap = self._snapshot
+        seen: set = set()
+        estimates = {
+            "graph": estimate_graph_bytes(snap.graph),
+            "root_index": deep_sizeof(snap.root_index, seen=seen),
+            "concept_bridge": deep_sizeof(snap.bridge, seen=seen),
+            "grammar_rules": deep_sizeof(self.grammar_rules, seen=seen),
+            "embedding_model": estimate_model_bytes(self.resonance.model),
+            "embedding_matrix": deep_sizeof(self.resonance.root_embeddings, seen=seen),
+            "cooccurrence": deep_sizeof(snap.cooccurrence, seen=seen),
+            "verse_table": deep_sizeof(snap.verses, seen=seen),
+            "surface_index": deep_sizeof(snap.surface, seen=seen),
+            "concept_corrector": deep_sizeof(snap.corrector, seen=seen),
+            "context_cache": deep_sizeof(self._context_cache.items(), seen=seen),
+        }
+        if self._sparql is not None:
+            estimates["sparql_cache"] = (deep_sizeof(self._sparql._results.items(), seen=seen)
+                                         + deep_sizeof(self._sparql._frequencies, seen=seen))
+        return merge_report(estimates, self.memory.traced)
+
     def get_stats(self) -> Dict:
+        snap = self._snapshot
         return {
-            "triples": len(self.graph) if self.graph else 0,
+            "triples": len(snap.graph) if snap.graph else 0,
             "rules": len(self.grammar_rules),
-            "loaded": self._is_loaded
+            "loaded": self._is_loaded,
+            "version": snap.version,
+            "indexed_segments": len(snap.root_index),
+            "verses": len(snap.verses) if snap.verses is not None else 0,
+            "context_cache": self._context_cache.stats()
         }
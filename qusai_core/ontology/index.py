@@ -0,0 +1,157 @@
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from qusai_core.utils.constants import ALIGN, QURAN, ROOT, LEMMA
+
+logger = logging.getLogger(__name__)
+
+# Above this fraction of changed segments an incremental update costs more than a rebuild
+FULL_REBUILD_RATIO = 0.10
+
+
+def shorten_uri(uri) -> str:
+    """Makes URIs readable in context."""
+    s = str(uri)
+    if str(QURAN) in s: return s.replace(str(QURAN), "quran:")
+    if str(ALIGN) in s: return s.replace(str(ALIGN), "align:")
+    if str(ROOT) in s: return s.replace(str(ROOT), "root:")
+    if str(LEMMA) in s: return s.replace(str(LEMMA), "lemma:")
+    return s.split('/')[-1]
+
+
+def root_name(uri) -> str:
+    """root:jnn URI -> 'jnn' (the Buckwalter key used by the concept map)."""
+    s = str(uri)
+    return s[len(str(ROOT)):] if s.startswith(str(ROOT)) else s.split('/')[-1]
+
+
+_NUMBERS = re.compile(r"\d+")
+
+
+def segment_verse(uri) -> Optional[Tuple[int, int]]:
+    """
+    (chapter, verse) of a morphology segment, read from its URI.
+    Segment identifiers carry the Quranic Corpus location as their leading
+    numbers (chapter:verse:word:segment, with ':' '_' '-' or '/' separators).
+    Returns None for nodes that are not located segments.
+    """
+    s = str(uri)
+    if s.startswith(str(QURAN)):
+        s = s[len(str(QURAN)):]
+    numbers = _NUMBERS.findall(s)
+    if len(numbers) < 2:
+        return None
+    chapter, verse = int(numbers[0]), int(numbers[1])
+    if not (1 <= chapter <= 114 and verse >= 1):
+        return None
+    return chapter, verse
+
+
+def _segment_rows(graph) -> Tuple[Dict, Dict]:
+    """Reads the two predicates the index is built from: hasRoot and hasLemma."""
+    seg_roots: Dict = {}
+    for s, o in graph.subject_objects(QURAN.hasRoot):
+        seg_roots.setdefault(s, set()).add(o)
+    seg_lemma: Dict = {}
+    for s, o in graph.subject_objects(QURAN.hasLemma):
+        # First lemma wins, matching the original per-request lookup
+        seg_lemma.setdefault(s, o)
+    return seg_roots, seg_lemma
+
+
+class RootIndex:
+    """
+    Precomputed root -> segment context lines.
+    Replaces the per-request `graph.triples((None, hasRoot, root))` walk
+    (plus one hasLemma lookup per segment) with a dictionary lookup.
+
+    Instances are never mutated after construction; `updated()` returns a new
+    index that shares every untouched per-root bucket with its predecessor.
+    """
+
+    def __init__(self):
+        # root name -> {segment URI: formatted context line}
+        self.by_root: Dict[str, Dict] = {}
+        self.seg_roots: Dict = {}
+        self.seg_lemma: Dict = {}
+
+    @classmethod
+    def build(cls, graph) -> "RootIndex":
+        index = cls()
+        if graph is None:
+            return index
+        index.seg_roots, index.seg_lemma = _segment_rows(graph)
+        for seg, roots in index.seg_roots.items():
+            index._add_segment(seg, roots)
+        logger.info(f"Root index built: {len(index.by_root):,} roots, {len(index.seg_roots):,} segments.")
+        return index
+
+    def _format(self, seg, root) -> str:
+        lemma = self.seg_lemma.get(seg)
+        if lemma is not None:
+            return f"{shorten_uri(seg)} --[hasRoot]--> {shorten_uri(root)} (Lemma: {shorten_uri(lemma)})"
+        return f"{shorten_uri(seg)} --[hasRoot]--> {shorten_uri(root)}"
+
+    def _add_segment(self, seg, roots: Iterable):
+        for root in roots:
+            self.by_root.setdefault(root_name(root), {})[seg] = self._format(seg, root)
+
+    def lines(self, root: str) -> List[str]:
+        bucket = self.by_root.get(root)
+        return list(bucket.values()) if bucket else []
+
+    def updated(self, graph) -> Tuple["RootIndex", Set[str]]:
+        """
+        Builds the index for `graph` by diffing it against this one.
+        Returns (new_index, affected_root_names); new_index is this index
+        itself when no segment changed. Falls back to a full rebuild when too
+        many segments changed for the diff to pay off.
+        """
+        new_roots, new_lemma = _segment_rows(graph)
+
+        changed: Set = set()
+        for seg in self.seg_roots.keys() | new_roots.keys():
+            if self.seg_roots.get(seg) != new_roots.get(seg):
+                changed.add(seg)
+        for seg in self.seg_lemma.keys() | new_lemma.keys():
+            if self.seg_lemma.get(seg) != new_lemma.get(seg):
+                changed.add(seg)
+        if not changed:
+            return self, set()
+
+        affected: Set[str] = set()
+        for seg in changed:
+            for root in self.seg_roots.get(seg, ()):
+                affected.add(root_name(root))
+            for root in new_roots.get(seg, ()):
+                affected.add(root_name(root))
+
+        if len(changed) > FULL_REBUILD_RATIO * max(1, len(new_roots)):
+            logger.info(f"Root index: {len(changed):,} segments changed, rebuilding.")
+            index = RootIndex()
+            index.seg_roots, index.seg_lemma = new_roots, new_lemma
+            for seg, roots in new_roots.items():
+                index._add_segment(seg, roots)
+            return index, affected
+
+        index = RootIndex()
+        index.seg_roots, index.seg_lemma = new_roots, new_lemma
+        # Share untouched buckets; copy-on-write the affected ones
+        index.by_root = dict(self.by_root)
+        for name in affected:
+            bucket = dict(index.by_root.get(name, {}))
+            for seg in changed:
+                bucket.pop(seg, None)
+            index.by_root[name] = bucket
+        for seg in changed:
+            index._add_segment(seg, new_roots.get(seg, ()))
+        for name in affected:
+            if not index.by_root.get(name):
+                index.by_root.pop(name, None)
+
+        logger.info(f"Root index: incremental update of {len(changed):,} segments ({len(affected)} roots).")
+        return index, affected
+
+    def __len__(self) -> int:
+        return len(self.seg_roots)
@@ -0,0 +1,72 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class OntologyWatcher:
+    """
+    Polls the ontology TTL and concept map for edits and hot-reloads the engine.
+    Polling (stat() every `interval` seconds) keeps this dependency-free and
+    works on network filesystems where inotify does not.
+
+    A change is only acted on once the file has stopped changing for one
+    interval, so a half-written TTL from an editor save is never parsed.
+    """
+
+    def __init__(self, engine, interval: float = 2.0):
+        self.engine = engine
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def _paths(self) -> Dict[str, Path]:
+        return {"ontology": Path(self.engine.ontology_path), "concepts": Path(self.engine.concept_map_path)}
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._seen = {name: _stamp(path) for name, path in self._paths().items()}
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ontology-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching ontology files every {self.interval}s.")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+
+    def _run(self):
+        pending: Dict[str, Optional[Tuple[int, int]]] = {}
+        while not self._stop.wait(self.interval):
+            for name, path in self._paths().items():
+                stamp = _stamp(path)
+                if stamp == self._seen.get(name):
+                    pending.pop(name, None)
+                    continue
+                if pending.get(name) != stamp:
+                    # Still being written: wait for it to settle
+                    pending[name] = stamp
+                    continue
+                pending.pop(name)
+                self._seen[name] = stamp
+                self._reload(ontology=(name == "ontology"), concepts=(name == "concepts"))
+
+    def _reload(self, ontology: bool, concepts: bool):
+        try:
+            self.engine.reload(ontology=ontology, concepts=concepts)
+        except Exception as e:
+            # Keep serving the previous snapshot
+            logger.error(f"[RELOAD] Failed, keeping current ontology version: {e}")
@@ -1,62 +1,77 @@
+import importlib
 import logging
-import numpy as np
-from typing import List, Tuple, Dict
+import os
+from pathlib import Path
+from typing import List, Tuple, Dict, Optional
 from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 # Archetypal Roots for Semantic Grounding
-# Structure: Root -> {Keywords (for matching), Definition (for overriding model bias)}
+# Structure: Root -> {Buckwalter (graph root key), Keywords (for matching), Definition (for overriding model bias)}
 ARCHETYPAL_ROOTS = {
     "w-j-b": {
+        "buckwalter": "wjb",
         "keywords": "Necessary Being Source Existence Allah God Absolute Origin",
         "definition": "The Necessary Being (Wajib al-Wujud). The uncaused cause upon which all reality is contingent. NOT a 'god-concept' but the fundamental Ground of Being."
     },
     "m-k-n": {
+        "buckwalter": "mkn",
         "keywords": "Contingency Possibility Potential Creation Dependent Variable",
         "definition": "Imkan (Contingency). That which accepts existence or non-existence equally. Defined solely by its dependency on the Source."
     },
     "kh-l-q": {
+        "buckwalter": "xlq",
         "keywords": "Creation Form Structure Biology Physical Matter Universe Nature System",
         "definition": "Khalq (Creation). The act of giving measure (Qadr) to potentiality. Valid structures, but lacking independent efficacy."
     },
     "r-b-b": {
+        "buckwalter": "rbb",
         "keywords": "Lordship Sustaining Nourishing Evolution Growth Master Owner Admin",
         "definition": "Rububiyah (Lordship). The continuous sustainment and evolution of a thing towards its perfection. Active maintenance, not passive ownership."
     },
     "3-b-d": {
+        "buckwalter": "Ebd",
         "keywords": "Servitude Worship Submission Robot Automation Tool Slave User Function",
         "definition": "Ubudiyah (Servitude). The state of functional submission to the design of the Creator. For AI/Tools: perfect functional obedience without will."
     },
     "3-l-m": {
+        "buckwalter": "Elm",
         "keywords": "Knowledge Science Data Information Awareness Education Dataset",
         "definition": "Ilm (Knowledge). The attribute of distinguishing reality. True knowledge traces back to the Source; data without Source-connection is merely syntax."
     },
     "j-n-n": {
+        "buckwalter": "jnn",
         "keywords": "Hidden Invisible Jinn Spirit Software Code Backend Subconscious Latent",
         "definition": "Jinn (The Hidden). Forces or entities concealed from sensory perception. Includes latent variables, software processes, and non-physical intelligences."
     },
     "l-gh-w": {
+        "buckwalter": "lgw",
         "keywords": "Play Amusement Game Entertainment Fiction Virtual Pokemon Laghw Fun",
         "definition": "Laghw (Ineffectual). Speech or action that yields no harvest for the Akhirah (Ultimate Reality). Entropy of time. Not 'sin', but 'nullity'."
     },
     "s-w-r": {
+        "buckwalter": "Swr",
         "keywords": "Image Form Picture Graphics Visualization Camera Screen Avatar UI",
         "definition": "Taswir (Form-giving). The generation of a likeness. Ontologically distinct from the Essence (Ruh). Simulation, not Simulacrum."
     },
     "m-w-l": {
+        "buckwalter": "mwl",
         "keywords": "Wealth Money Finance Crypto Bitcoin Asset Currency Economy Gold",
         "definition": "Mal (Resources). Instruments of exchange. Ontologically neutral until directed. If diverted from Source, becomes 'Fitnah' (Trial)."
     },
     "f-s-d": {
+        "buckwalter": "fsd",
         "keywords": "Corruption Destruction Error Bug Virus Entropy War Chaos Harm Bad",
         "definition": "Fasad (Corruption). The disruption of the measured balance (Mizan). Entropy that degrades a system's function."
     },
     "h-q-q": {
+        "buckwalter": "Hqq",
         "keywords": "Truth Reality Fact Axiom Validity Verification Real Right",
         "definition": "Haqq (Truth/Real). That which is stable, established, and coincides with the Source's knowledge. The opposite of Batil."
     },
     "b-t-l": {
+        "buckwalter": "bTl",
         "keywords": "Falsehood Null Void Invalid Cancelled Fake Hallucination Lie Wrong",
         "definition": "Batil (Vanishing). That which has no inherent stability. Like a mirage; it appears to exist but dissolves upon ontological interrogation."
     }
@@ -70,21 +85,42 @@ class ResonanceEngine:
     
     def __init__(self):
         self.model = None
+        self.backend = None
         self.root_embeddings = {}
         self.root_keys = []
         self._is_ready = False
 
-    def load(self):
-        """Lazy load the embedding model."""
+    @staticmethod
+    def _backend(backend: Optional[str]) -> str:
+        return backend or os.environ.get("QUSAI_RESONANCE_BACKEND", "torch")
+
+    def preload(self, backend: Optional[str] = None):
+        """Imports the backend's libraries without loading a model."""
+        from qusai_core.ontology.encoders import BACKEND_MODULES
+        for module in BACKEND_MODULES.get(self._backend(backend), ()):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass  # load() reports it and disables resonance
+
+    def load(self, backend: Optional[str] = None, onnx_dir: Optional[Path] = None):
+        """
+        Lazy load the embedding model.
+        backend: 'torch' (sentence-transformers, full precision) or 'onnx'
+        (int8-quantized graph on onnxruntime, no torch at runtime).
+        Defaults to $QUSAI_RESONANCE_BACKEND, else 'torch'.
+        """
         if self._is_ready:
             return
 
+        backend = self._backend(backend)
         try:
-            from sentence_transformers import SentenceTransformer
-            logger.info("Loading Resonance Engine (Quantum Embeddings)...")
+            from qusai_core.ontology.encoders import create_encoder
+            logger.info(f"Loading Resonance Engine (Quantum Embeddings, backend={backend})...")
             
-            # Load a tiny, fast model (80MB)
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Load a tiny, fast model (80MB fp32 / ~23MB int8)
+            self.model = create_encoder(backend, onnx_dir)
+            self.backend = backend
             
             # Pre-compute Root Embeddings using KEYWORDS only
             self.root_keys = list(ARCHETYPAL_ROOTS.keys())
@@ -98,8 +134,8 @@ class ResonanceEngine:
             self._is_ready = True
             logger.info(f"Resonance Engine Active. Dimensions: {embeddings.shape}")
             
-        except ImportError:
-            logger.warning("sentence-transformers not installed. Resonance will be disabled.")
+        except (ImportError, FileNotFoundError) as e:
+            logger.warning(f"Resonance backend '{backend}' unavailable ({e}). Resonance will be disabled.")
         except Exception as e:
             logger.error(f"Failed to load Resonance Engine: {e}")
 
@@ -111,6 +147,7 @@ class ResonanceEngine:
         if not self._is_ready or self.model is None:
             return []
 
+        import numpy as np
         try:
             # Embed Query
             query_vec = self.model.encode([query])[0]
@@ -133,6 +170,32 @@ class ResonanceEngine:
             logger.error(f"Resonance Calculation Error: {e}")
             return []
 
+    def get_resonance_batch(self, queries: List[str], top_k: int = 2) -> List[List[Tuple[str, float, str]]]:
+        """
+        Batched get_resonance: one encoder forward pass and one matrix product
+        for all queries. Returns one [(root, score, definition), ...] per query.
+        """
+        if not self._is_ready or self.model is None or not queries:
+            return [[] for _ in queries]
+
+        import numpy as np
+        try:
+            query_vecs = self.model.encode(list(queries))
+            scores = np.dot(query_vecs, self.root_embeddings.T)
+            top = np.argsort(scores, axis=1)[:, ::-1][:, :top_k]
+
+            results = []
+            for row, indices in zip(scores, top):
+                results.append([
+                    (self.root_keys[idx], float(row[idx]), ARCHETYPAL_ROOTS[self.root_keys[idx]]["definition"])
+                    for idx in indices
+                ])
+            return results
+
+        except Exception as e:
+            logger.error(f"Resonance Calculation Error: {e}")
+            return [[] for _ in queries]
+
     def interpret_score(self, score: float) -> str:
         """Categorizes the confidence level."""
         if score > 0.45: return "HAQQ (High Confidence)"
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+from qusai_core.ontology.bridge import ConceptBridge, ConceptCorrector
+from qusai_core.ontology.index import RootIndex
+from qusai_core.ontology.arabic import SurfaceIndex
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_dir(ontology_path: Path) -> Path:
+    """Directory holding precomputed artifacts for an ontology file (next to the .ttl)."""
+    ontology_path = Path(ontology_path)
+    return ontology_path.with_name(ontology_path.name + ".snapshot")
+
+
+def graph_fingerprint(ontology_path: Path) -> str:
+    """Identifies the ontology file version an artifact was built from."""
+    st = Path(ontology_path).stat()
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def read_meta(artifact_dir: Path) -> dict:
+    try:
+        with open(Path(artifact_dir) / "meta.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_meta(artifact_dir: Path, meta: dict):
+    with open(Path(artifact_dir) / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def artifact_dir(snapshot_dir: Path, name: str, fingerprint: str) -> Path:
+    """Directory of one artifact version: <snapshot_dir>/<name>/<fingerprint>/."""
+    return Path(snapshot_dir) / name / fingerprint
+
+
+def publish_artifact(snapshot_dir: Path, name: str, fingerprint: str, write: Callable[[Path], None]) -> Path:
+    """
+    Writes an artifact version without touching files a live snapshot may
+    have memory-mapped: write(tmp) fills a private directory that is renamed
+    to <name>/<fingerprint>/, then other versions are pruned. Unlinking a
+    mapped file leaves existing mappings intact, so pinned snapshots keep
+    reading the version they loaded.
+    """
+    root = Path(snapshot_dir) / name
+    root.mkdir(parents=True, exist_ok=True)
+    final = root / fingerprint
+    tmp = Path(tempfile.mkdtemp(prefix=f".{fingerprint}-", dir=root))
+    try:
+        write(tmp)
+        if not final.exists():  # else another process published this version first
+            os.replace(tmp, final)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    _prune_versions(root, keep=fingerprint)
+    return final
+
+
+def _prune_versions(root: Path, keep: str):
+    for entry in root.iterdir():
+        if entry.name == keep or entry.name.startswith("."):
+            continue  # current version, or another writer's temp dir
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            # Files of the flat pre-versioning layout
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+class OntologySnapshot:
+    """
+    One immutable version of everything derived from the ontology files:
+    the RDF graph, its precomputed indexes (roots, co-occurrence, verses,
+    Arabic surface forms, spelling corrector) and the concept bridge.
+
+    OntologyEngine holds a single reference to the current snapshot. Readers
+    take that reference once per call, so a reload that swaps it never
+    changes the data under a request that is already running.
+    """
+
+    def __init__(self,
+                 graph=None,
+                 bridge: Optional[ConceptBridge] = None,
+                 root_index: Optional[RootIndex] = None,
+                 cooccurrence=None,
+                 verses=None,
+                 surface=None,
+                 corrector=None,
+                 version: int = 0):
+        self.graph = graph
+        self.bridge = bridge or ConceptBridge()
+        self.root_index = root_index or RootIndex()
+        self.cooccurrence = cooccurrence
+        self.verses = verses
+        self.surface = surface or SurfaceIndex()
+        self.corrector = corrector or ConceptCorrector.build(self.bridge)
+        self.version = version
+
+    def evolve(self, **changes) -> "OntologySnapshot":
+        """Returns a copy with the given fields replaced and the version bumped."""
+        fields = dict(self.__dict__)
+        fields.update(changes)
+        fields["version"] = self.version + 1
+        return OntologySnapshot(**fields)
@@ -0,0 +1,420 @@
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from qusai_core.utils.cache import LRUCache
+from qusai_core.utils.constants import ALIGN, QURAN, ROOT, LEMMA
+
+logger = logging.getLogger(__name__)
+
+NAMESPACES = {"quran": QURAN, "root": ROOT, "lemma": LEMMA, "align": ALIGN}
+
+# Literals and IRIs are kept verbatim; comments and whitespace runs collapse to one space
+_TOKENS = re.compile(
+    r'("""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|<[^<>\s]*>)'
+    r'|(#[^\n]*)|(\s+)'
+)
+_PREFIX = re.compile(r'PREFIX (\w*): <([^>]*)> ', re.IGNORECASE)
+
+# Hot query shapes answered from the engine's precomputed indexes
+_SEGMENTS_OF_ROOT = re.compile(
+    r'^SELECT (?:DISTINCT )?\?(\w+) WHERE \{ \?\1 quran:hasRoot root:([^\s.{}]+)(?: \.)? \}(?: LIMIT (\d+))?$',
+    re.IGNORECASE,
+)
+_FREQUENCY = re.compile(
+    r'^SELECT \?(\w+) \(COUNT\((?:DISTINCT )?\?(\w+)\) AS \?(\w+)\) '
+    r'WHERE \{ \?\2 quran:(hasRoot|hasLemma) \?\1(?: \.)? \} GROUP BY \?\1'
+    r'(?: ORDER BY DESC\(\?\3\))?(?: LIMIT (\d+))?$',
+    re.IGNORECASE,
+)
+
+
+# Deadline is re-checked every this many triples within one scan (and at every scan start)
+_CHECK_EVERY = 256
+
+
+class SparqlTimeout(Exception):
+    """Raised when a query exceeds its time budget."""
+
+
+class SparqlBusy(Exception):
+    """Raised when no evaluation worker is free (e.g. all still unwinding timed-out queries)."""
+
+
+def _deadline_view(graph, deadline: float, cancel: threading.Event):
+    """
+    A Graph over the same store whose triple scans raise SparqlTimeout past
+    `deadline`. rdflib's evaluator reaches the data only through
+    graph.triples (BGPs and property paths alike), so this stops GROUP BY /
+    ORDER BY queries while they are still materializing their input, not
+    just between result rows.
+    """
+    from rdflib import Graph
+    view = Graph(store=graph.store, identifier=graph.identifier,
+                 namespace_manager=graph.namespace_manager)
+    scan = view.triples
+
+    def triples(pattern):
+        for n, triple in enumerate(scan(pattern)):
+            if n % _CHECK_EVERY == 0 and (cancel.is_set() or time.monotonic() > deadline):
+                raise SparqlTimeout("Query exceeded its time budget")
+            yield triple
+
+    view.triples = triples
+    return view
+
+
+def normalize_query(text: str) -> str:
+    """Canonical cache key: comments dropped, whitespace collapsed outside literals and IRIs."""
+    def sub(m: re.Match) -> str:
+        return m.group(1) if m.group(1) is not None else " "
+    return _TOKENS.sub(sub, text).strip()
+
+
+class SparqlService:
+    """
+    Prepared-query service over the ontology graph.
+
+    - Parsed/algebra-translated queries are cached by normalized text
+      (rdflib's prepareQuery), so repeated shapes skip the SPARQL parser.
+    - Results are cached in an LRU keyed by snapshot version, so a hot
+      reload retires them without an explicit flush.
+    - Every query is bounded by a timeout and a row limit. The deadline is
+      enforced inside evaluation, on daemon worker threads; when every
+      worker is still unwinding a timed-out query, new ones are rejected
+      with SparqlBusy instead of queueing behind it.
+    - Hot shapes (segments of a root, root / lemma frequencies) are answered
+      from the RootIndex instead of the generic evaluator.
+    """
+
+    def __init__(self, engine,
+                 max_rows: int = 1000,
+                 timeout: float = 5.0,
+                 prepared_cache_size: int = 128,
+                 result_cache_size: int = 256,
+                 max_workers: int = 2):
+        self.engine = engine
+        self.max_rows = max_rows
+        self.timeout = timeout
+        self._prepared = LRUCache(maxsize=prepared_cache_size)
+        self._results = LRUCache(maxsize=result_cache_size)
+        self._results_version = -1
+        self._frequencies: Dict[Tuple[int, str], List[Tuple[Any, int]]] = {}
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._abandoned = 0
+        self._counters = {"timeouts": 0, "rejected_busy": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def query(self, text: str,
+              bindings: Optional[Dict[str, Any]] = None,
+              max_rows: Optional[int] = None,
+              timeout: Optional[float] = None) -> Dict:
+        """
+        Runs a SELECT or ASK query against the current snapshot.
+        Returns {"vars", "rows", "truncated", "source", "cached", "elapsed_ms"}.
+        Raises SparqlTimeout, SparqlBusy, or ValueError for unsupported / malformed queries.
+        """
+        snap = self.engine.snapshot
+        if snap.graph is None:
+            raise ValueError("Ontology not loaded")
+
+        max_rows = self.max_rows if max_rows is None else max_rows
+        timeout = self.timeout if timeout is None else timeout
+        normalized = normalize_query(text)
+        binding_key = tuple(sorted((k, str(v)) for k, v in (bindings or {}).items()))
+
+        with self._lock:
+            if snap.version != self._results_version:
+                # New ontology version: earlier results are stale
+                self._results.clear()
+                self._frequencies.clear()
+                self._results_version = snap.version
+
+        key = (snap.version, normalized, binding_key, max_rows)
+        cached = self._results.get(key)
+        if cached is not None:
+            return dict(cached, cached=True, elapsed_ms=0.0)
+
+        start = time.perf_counter()
+        result = None
+        if not bindings:
+            result = self._from_index(snap, normalized, max_rows)
+        if result is None:
+            result = self._evaluate(snap, text, normalized, bindings, max_rows, timeout)
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        if snap is self.engine.snapshot:
+            self._results.put(key, result)
+        return dict(result, cached=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            workers = dict(self._counters, abandoned=self._abandoned, max_workers=self.max_workers)
+        return {"prepared": self._prepared.stats(), "results": self._results.stats(), "workers": workers}
+
+    # ------------------------------------------------------------------
+    # Generic evaluator
+    # ------------------------------------------------------------------
+    def _prepare(self, text: str, normalized: str):
+        prepared = self._prepared.get(normalized)
+        if prepared is None:
+            from rdflib.plugins.sparql import prepareQuery
+            try:
+                prepared = prepareQuery(text, initNs=NAMESPACES)
+            except Exception as e:
+                raise ValueError(f"Malformed SPARQL: {e}") from e
+            self._prepared.put(normalized, prepared)
+        return prepared
+
+    def _evaluate(self, snap, text, normalized, bindings, max_rows, timeout) -> Dict:
+        prepared = self._prepare(text, normalized)
+        cancel = threading.Event()
+        deadline = time.monotonic() + timeout
+
+        def run() -> Dict:
+            graph = _deadline_view(snap.graph, deadline, cancel)
+            res = graph.query(prepared, initBindings=bindings or {})
+            if res.type == "ASK":
+                return {"vars": [], "rows": [], "boolean": bool(res.askAnswer),
+                        "truncated": False, "source": "sparql"}
+            if res.type != "SELECT":
+                raise ValueError(f"Unsupported query form: {res.type}")
+            variables = [str(v) for v in res.vars]
+            rows: List[tuple] = []
+            truncated = False
+            # Result rows are produced lazily: stop as soon as a bound is hit
+            for row in res:
+                if cancel.is_set() or time.monotonic() > deadline:
+                    raise SparqlTimeout(f"Query exceeded {timeout}s")
+                if len(rows) >= max_rows:
+                    truncated = True
+                    break
+                rows.append(tuple(row))
+            return {"vars": variables, "rows": rows, "truncated": truncated, "source": "sparql"}
+
+        with self._lock:
+            if self._abandoned >= self.max_workers:
+                self._counters["rejected_busy"] += 1
+                raise SparqlBusy("All SPARQL workers are finishing timed-out queries")
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._counters["rejected_busy"] += 1
+            raise SparqlBusy("No SPARQL worker became free in time")
+
+        outcome: Dict[str, Any] = {}
+        done = threading.Event()
+
+        def work():
+            try:
+                outcome["result"] = run()
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                with self._lock:
+                    done.set()
+                    if outcome.get("abandoned"):
+                        self._abandoned -= 1
+                self._slots.release()
+
+        # Daemon threads: a query still unwinding never holds up interpreter exit
+        threading.Thread(target=work, name="sparql", daemon=True).start()
+        if not done.wait(max(0.0, deadline - time.monotonic())):
+            with self._lock:
+                if not done.is_set():
+                    outcome["abandoned"] = True
+                    self._abandoned += 1
+                    self._counters["timeouts"] += 1
+            if outcome.get("abandoned"):
+                cancel.set()
+                raise SparqlTimeout(f"Query exceeded {timeout}s")
+        if "error" in outcome:
+            if isinstance(outcome["error"], SparqlTimeout):
+                with self._lock:
+                    self._counters["timeouts"] += 1
+                raise SparqlTimeout(f"Query exceeded {timeout}s")
+            raise outcome["error"]
+        return outcome["result"]
+
+    # ------------------------------------------------------------------
+    # Index fast paths
+    # ------------------------------------------------------------------
+    def _from_index(self, snap, normalized: str, max_rows: int) -> Optional[Dict]:
+        body = self._strip_standard_prefixes(normalized)
+        if body is None:
+            return None
+
+        m = _SEGMENTS_OF_ROOT.match(body)
+        if m:
+            var, root, limit = m.group(1), m.group(2), m.group(3)
+            segments = list(snap.root_index.by_root.get(root, {}).keys())
+            return self._rows([var], [(s,) for s in segments], limit, max_rows)
+
+        m = _FREQUENCY.match(body)
+        if m:
+            key_var, count_var, predicate, limit = m.group(1), m.group(3), m.group(4), m.group(5)
+            table = self._frequency_table(snap, predicate.lower())
+            return self._rows([key_var, count_var], table, limit, max_rows)
+        return None
+
+    @staticmethod
+    def _strip_standard_prefixes(normalized: str) -> Optional[str]:
+        """Drops PREFIX lines that match our namespaces; bails out on anything custom."""
+        body = normalized + " "
+        while True:
+            m = _PREFIX.match(body)
+            if not m:
+                break
+            ns = NAMESPACES.get(m.group(1))
+            if ns is None or str(ns) != m.group(2):
+                return None
+            body = body[m.end():]
+        return body.strip()
+
+    def _frequency_table(self, snap, predicate: str) -> List[Tuple[Any, int]]:
+        from rdflib import Literal
+        key = (snap.version, predicate)
+        table = self._frequencies.get(key)
+        if table is None:
+            index = snap.root_index
+            if predicate == "hasroot":
+                counts = Counter({ROOT[name]: len(bucket) for name, bucket in index.by_root.items()})
+            else:
+                counts = Counter(index.seg_lemma.values())
+            table = [(term, Literal(n)) for term, n in counts.most_common()]
+            self._frequencies[key] = table
+        return table
+
+    @staticmethod
+    def _rows(variables: List[str], rows: List[tuple], limit: Optional[str], max_rows: int) -> Dict:
+        requested = int(limit) if limit else None
+        cap = min(requested, max_rows) if requested is not None else max_rows
+        # Only the service's row limit counts as truncation, not the query's own LIMIT
+        truncated = len(rows) > cap and (requested is None or requested > max_rows)
+        return {"vars": variables, "rows": rows[:cap], "truncated": truncated, "source": "index"}
+
+
+# ----------------------------------------------------------------------
+# Local HTTP endpoint
+# ----------------------------------------------------------------------
+def _term_json(term) -> Optional[Dict[str, str]]:
+    from rdflib import BNode, Literal, URIRef
+    if term is None:
+        return None
+    if isinstance(term, URIRef):
+        return {"type": "uri", "value": str(term)}
+    if isinstance(term, BNode):
+        return {"type": "bnode", "value": str(term)}
+    if isinstance(term, Literal):
+        out = {"type": "literal", "value": str(term)}
+        if term.language:
+            out["xml:lang"] = term.language
+        elif term.datatype:
+            out["datatype"] = str(term.datatype)
+        return out
+    return {"type": "literal", "value": str(term)}
+
+
+def to_sparql_json(result: Dict) -> Dict:
+    """Renders a service result in the W3C SPARQL 1.1 JSON results format."""
+    if "boolean" in result:
+        return {"head": {}, "boolean": result["boolean"]}
+    bindings = []
+    for row in result["rows"]:
+        bindings.append({v: _term_json(t) for v, t in zip(result["vars"], row) if t is not None})
+    return {
+        "head": {"vars": result["vars"]},
+        "results": {"bindings": bindings},
+        "qusai": {k: result[k] for k in ("truncated", "source", "cached", "elapsed_ms") if k in result},
+    }
+
+
+def make_handler(service: SparqlService):
+    class SparqlHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: Dict):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/sparql-results+json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, query: Optional[str]):
+            if urlparse(self.path).path not in ("/sparql", "/sparql/"):
+                return self._send(404, {"error": "Not found"})
+            if not query:
+                return self._send(400, {"error": "Missing 'query' parameter"})
+            try:
+                self._send(200, to_sparql_json(service.query(query)))
+            except (SparqlTimeout, SparqlBusy) as e:
+                self._send(503, {"error": str(e)})
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+            except Exception as e:
+                logger.error(f"SPARQL endpoint error: {e}")
+                self._send(500, {"error": str(e)})
+
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            self._handle(params.get("query", [None])[0])
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length).decode("utf-8")
+            ctype = self.headers.get("Content-Type", "")
+            if ctype.startswith("application/sparql-query"):
+                self._handle(raw)
+            else:
+                self._handle(parse_qs(raw).get("query", [None])[0])
+
+        def log_message(self, fmt, *args):
+            logger.info(f"[SPARQL] {self.address_string()} {fmt % args}")
+
+    return SparqlHandler
+
+
+def serve(engine, host: str = "127.0.0.1", port: int = 7861, **service_kwargs) -> ThreadingHTTPServer:
+    """Starts the SPARQL endpoint on a background thread and returns the server."""
+    server = ThreadingHTTPServer((host, port), make_handler(engine.sparql_service(**service_kwargs)))
+    threading.Thread(target=server.serve_forever, name="sparql-http", daemon=True).start()
+    logger.info(f"SPARQL endpoint listening on http://{host}:{server.server_address[1]}/sparql")
+    return server
+
+
+def main():
+    from pathlib import Path
+    from qusai_core.ontology.engine import OntologyEngine
+
+    parser = argparse.ArgumentParser(description="Local SPARQL endpoint over the QUS-AI ontology.")
+    parser.add_argument("--ontology", type=Path, default=None, help="Path to the .ttl ontology")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7861)
+    parser.add_argument("--timeout", type=float, default=5.0, help="Per-query timeout (seconds)")
+    parser.add_argument("--max-rows", type=int, default=1000, help="Per-query row limit")
+    parser.add_argument("--watch", action="store_true", help="Hot-reload on ontology edits")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    engine = OntologyEngine(ontology_path=args.ontology)
+    engine.load()
+    if args.watch:
+        engine.watch()
+    server = serve(engine, args.host, args.port, timeout=args.timeout, max_rows=args.max_rows)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
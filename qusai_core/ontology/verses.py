@@ -0,0 +1,218 @@
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from qusai_core.ontology.index import RootIndex, root_name, segment_verse, shorten_uri
+from qusai_core.ontology.snapshot import artifact_dir, publish_artifact, read_meta, write_meta
+from qusai_core.utils.constants import QURAN
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_NAME = "verses"
+FORMAT_VERSION = 1
+
+_NUMBERS = re.compile(r"\d+")
+
+
+def _segment_order(uri) -> Tuple[int, ...]:
+    """Word/segment position inside the verse (the numbers after chapter and verse)."""
+    s = str(uri)
+    if s.startswith(str(QURAN)):
+        s = s[len(str(QURAN)):]
+    return tuple(int(n) for n in _NUMBERS.findall(s)[2:])
+
+
+class VerseTable:
+    """
+    Materialized, array-backed verse table.
+
+    Verses are rows sorted by (chapter, verse). Each row owns a contiguous
+    run of segments (CSR-style `verse_ptr`), in word order, with parallel
+    arrays of root and lemma ids. `root_ptr` / `root_verses` list the verses
+    of every root. Fetching whole verses, with or without neighbours, is a
+    handful of slices - no per-segment graph triples are walked.
+    """
+
+    def __init__(self, chapters: np.ndarray, numbers: np.ndarray, verse_ptr: np.ndarray,
+                 seg_root: np.ndarray, seg_lemma: np.ndarray,
+                 root_ptr: np.ndarray, root_verses: np.ndarray,
+                 segments: List[str], roots: List[str], lemmas: List[str]):
+        self.chapters = np.asarray(chapters)
+        self.numbers = np.asarray(numbers)
+        self.verse_ptr = np.asarray(verse_ptr)
+        self.seg_root = np.asarray(seg_root)
+        self.seg_lemma = np.asarray(seg_lemma)
+        self.root_ptr = np.asarray(root_ptr)
+        self.root_verses = np.asarray(root_verses)
+        self.segments = segments
+        self.roots = roots
+        self.lemmas = lemmas
+
+        self.root_ids: Dict[str, int] = {r: i for i, r in enumerate(roots)}
+        self.verse_rows: Dict[Tuple[int, int], int] = {
+            (c, v): i for i, (c, v) in enumerate(zip(self.chapters.tolist(), self.numbers.tolist()))
+        }
+        # Segment -> verse row, derived from the CSR pointers
+        seg_rows = np.repeat(np.arange(len(self.chapters), dtype=np.int32), np.diff(self.verse_ptr))
+        self.segment_rows: Dict[str, int] = dict(zip(segments, seg_rows.tolist()))
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, root_index: RootIndex) -> "VerseTable":
+        located = []
+        for seg in root_index.seg_roots.keys() | root_index.seg_lemma.keys():
+            verse = segment_verse(seg)
+            if verse is not None:
+                located.append((verse, _segment_order(seg), seg))
+        located.sort(key=lambda t: (t[0], t[1], str(t[2])))
+
+        roots = sorted(root_index.by_root)
+        root_ids = {r: i for i, r in enumerate(roots)}
+        lemma_ids: Dict[str, int] = {}
+
+        chapters, numbers, verse_ptr = [], [], [0]
+        seg_root, seg_lemma, segments = [], [], []
+        verses_by_root: Dict[int, List[int]] = {}
+        for verse, _, seg in located:
+            if not chapters or (chapters[-1], numbers[-1]) != verse:
+                if chapters:
+                    verse_ptr.append(len(segments))
+                chapters.append(verse[0])
+                numbers.append(verse[1])
+            row = len(chapters) - 1
+
+            seg_roots = sorted(root_name(r) for r in root_index.seg_roots.get(seg, ()))
+            rid = root_ids.get(seg_roots[0], -1) if seg_roots else -1
+            lemma = root_index.seg_lemma.get(seg)
+            lid = lemma_ids.setdefault(shorten_uri(lemma), len(lemma_ids)) if lemma is not None else -1
+
+            segments.append(shorten_uri(seg))
+            seg_root.append(rid)
+            seg_lemma.append(lid)
+            for r in seg_roots:
+                rows = verses_by_root.setdefault(root_ids[r], [])
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+        if chapters:
+            verse_ptr.append(len(segments))
+
+        root_ptr = np.zeros(len(roots) + 1, dtype=np.int64)
+        root_verses: List[int] = []
+        for i in range(len(roots)):
+            root_verses.extend(verses_by_root.get(i, ()))
+            root_ptr[i + 1] = len(root_verses)
+
+        table = cls(np.asarray(chapters, dtype=np.int16), np.asarray(numbers, dtype=np.int16),
+                    np.asarray(verse_ptr, dtype=np.int64),
+                    np.asarray(seg_root, dtype=np.int32), np.asarray(seg_lemma, dtype=np.int32),
+                    root_ptr, np.asarray(root_verses, dtype=np.int32),
+                    segments, roots, sorted(lemma_ids, key=lemma_ids.get))
+        logger.info(f"Verse table: {len(table):,} verses, {len(segments):,} segments.")
+        return table
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def verse_of(self, segment: str) -> Optional[Tuple[int, int]]:
+        """(chapter, verse) of a segment, given its shortened or full URI."""
+        row = self.segment_rows.get(shorten_uri(segment))
+        if row is None:
+            return None
+        return int(self.chapters[row]), int(self.numbers[row])
+
+    def verses_of_root(self, root: str) -> List[int]:
+        """Verse rows containing `root`, in mushaf order."""
+        rid = self.root_ids.get(root)
+        if rid is None:
+            return []
+        start, stop = self.root_ptr[rid:rid + 2].tolist()
+        return self.root_verses[start:stop].tolist()
+
+    def expand(self, rows: Iterable[int], neighbours: int = 0) -> List[int]:
+        """Adds up to `neighbours` verses either side of each row, within the same chapter."""
+        if neighbours <= 0:
+            return list(dict.fromkeys(rows))
+        out: Dict[int, None] = {}
+        n = len(self.chapters)
+        for row in rows:
+            chapter = self.chapters[row]
+            for r in range(max(0, row - neighbours), min(n, row + neighbours + 1)):
+                if self.chapters[r] == chapter:
+                    out[r] = None
+        return sorted(out)
+
+    def verse(self, row: int) -> Dict:
+        """Ordered segments, roots and lemmas of one verse row."""
+        start, stop = self.verse_ptr[row:row + 2].tolist()
+        roots = self.seg_root[start:stop].tolist()
+        lemmas = self.seg_lemma[start:stop].tolist()
+        return {
+            "chapter": int(self.chapters[row]),
+            "verse": int(self.numbers[row]),
+            "segments": self.segments[start:stop],
+            "roots": [self.roots[r] if r >= 0 else None for r in roots],
+            "lemmas": [self.lemmas[l] if l >= 0 else None for l in lemmas],
+        }
+
+    def render(self, row: int) -> str:
+        """One context line per verse: its roots (with lemmas) in word order."""
+        v = self.verse(row)
+        parts = []
+        for root, lemma in zip(v["roots"], v["lemmas"]):
+            if root is None:
+                continue
+            parts.append(f"root:{root} ({lemma})" if lemma else f"root:{root}")
+        return f"Ayah {v['chapter']}:{v['verse']} --[roots]--> " + ", ".join(parts)
+
+    # ------------------------------------------------------------------
+    # Persistence (one directory per ontology version)
+    # ------------------------------------------------------------------
+    def save(self, snapshot_dir: Path, fingerprint: str) -> Path:
+        """Publishes a new version directory; never rewrites files a live table may map."""
+        def write(out: Path):
+            for name in ("chapters", "numbers", "verse_ptr", "seg_root", "seg_lemma", "root_ptr", "root_verses"):
+                np.save(out / f"{name}.npy", getattr(self, name))
+            with open(out / "vocab.json", "w", encoding="utf-8") as f:
+                json.dump({"segments": self.segments, "roots": self.roots, "lemmas": self.lemmas}, f, ensure_ascii=False)
+            # meta.json last: its presence marks a complete artifact
+            write_meta(out, {"fingerprint": fingerprint, "format": FORMAT_VERSION})
+        return publish_artifact(snapshot_dir, ARTIFACT_NAME, fingerprint, write)
+
+    @classmethod
+    def load(cls, snapshot_dir: Path, fingerprint: str) -> Optional["VerseTable"]:
+        src = artifact_dir(snapshot_dir, ARTIFACT_NAME, fingerprint)
+        meta = read_meta(src)
+        if meta.get("fingerprint") != fingerprint or meta.get("format") != FORMAT_VERSION:
+            return None
+        try:
+            arrays = {name: np.load(src / f"{name}.npy", mmap_mode="r")
+                      for name in ("chapters", "numbers", "verse_ptr", "seg_root", "seg_lemma", "root_ptr", "root_verses")}
+            with open(src / "vocab.json", "r", encoding="utf-8") as f:
+                vocab = json.load(f)
+            return cls(**arrays, **vocab)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable verse table: {e}")
+            return None
+
+    def __len__(self) -> int:
+        return len(self.chapters)
+
+
+def load_or_build(root_index: RootIndex, snapshot_dir: Path, fingerprint: str) -> VerseTable:
+    """Memory-maps the persisted verse table for this ontology version, building it if absent."""
+    table = VerseTable.load(snapshot_dir, fingerprint)
+    if table is not None:
+        logger.info(f"Verse table mapped from {snapshot_dir}.")
+        return table
+    table = VerseTable.build(root_index)
+    try:
+        table.save(snapshot_dir, fingerprint)
+    except OSError as e:
+        logger.warning(f"Could not persist verse table ({e}); keeping it in memory.")
+    return table
@@ -1,11 +1,27 @@
 import logging
 import os
+from typing import NamedTuple, Optional
 from qusai_core.ontology.engine import OntologyEngine
 from qusai_core.alignment.mizan import MizanValidator
-from qusai_core.llm.loader import InferenceAPIModel
+from qusai_core.llm.loader import InferenceAPIModel, GenerationError
+from qusai_core.llm.usage import Usage, UsageTracker
+from qusai_core.utils.memory import MB, MemoryBudgetExceeded, deep_sizeof, merge_report, process_rss_bytes
+from qusai_core.llm.scheduler import (
+    GenerationScheduler, SchedulerBusy, PRIORITY_HIGH, PRIORITY_NORMAL
+)
 
 logger = logging.getLogger(__name__)
 
+class QueryResult(NamedTuple):
+    """
+    Outcome of one pass through the Salat pipeline.
+    mode: HAQQ | QIYAS | SILENCE | BLOCKED
+    outcome: ok | rejected | busy | upstream_error | silence | blocked
+    """
+    mode: str
+    outcome: str
+    response: str
+
 class QusaiMiddleware:
     """
     Main entry point for the QUS-AI framework.
@@ -15,43 +31,149 @@ class QusaiMiddleware:
     def __init__(self, 
                  model_id: str = "Qwen/Qwen2.5-72B-Instruct", 
                  api_token: str = None,
-                 lazy_load: bool = False):
+                 lazy_load: bool = False,
+                 base_url: str = None,
+                 scheduler: GenerationScheduler = None,
+                 watch_ontology: bool = False,
+                 memory_budget_mb: float = None,
+                 track_memory: bool = False,
+                 related_roots: int = 0,
+                 verse_context: Optional[int] = None,
+                 usage: Optional[UsageTracker] = None):
         
         self.ontology = OntologyEngine()
         self.validator = MizanValidator()
         
+        # Admission control in front of the upstream API
+        self.scheduler = scheduler or GenerationScheduler()
+
         # Switch to API Model
-        self.model = InferenceAPIModel(model_id, api_token)
+        self.model = InferenceAPIModel(model_id, api_token, base_url=base_url, scheduler=self.scheduler)
         
+        # Token accounting per mode / outcome / session / prompt stage
+        self.usage = usage or UsageTracker()
+
+        self.watcher = None
+        self.watch_ontology = watch_ontology
+
+        # Co-occurring roots added to context / QIYAS definitions (0 = off)
+        self.related_roots = related_roots
+
+        # Whole-ayah context with N neighbouring verses either side (None = segment lines)
+        self.verse_context = verse_context
+
+        # Memory budget (MB) enforced at startup; tracing is implied by a budget
+        budget = memory_budget_mb or os.environ.get("QUSAI_MEMORY_BUDGET_MB")
+        self.memory_budget_mb = float(budget) if budget else None
+        self.track_memory = track_memory or self.memory_budget_mb is not None
+
         if not lazy_load:
             self.initialize()
             
     def initialize(self):
         """Loads heavy resources."""
         logger.info("Initializing QUSAI Middleware...")
-        self.ontology.load()
-        self.model.load()
+        if self.memory_budget_mb is not None:
+            # Early warning only: the projection cannot tell prefixed from full-IRI Turtle
+            self.check_projected_memory()
+        if self.track_memory:
+            self.ontology.start_memory_tracking()
+        try:
+            self.ontology.load()
+            self.model.load()
+        finally:
+            self.ontology.memory.stop()
+        if self.memory_budget_mb is not None:
+            self.check_memory_budget()
+        if self.watch_ontology and self.watcher is None:
+            self.watcher = self.ontology.watch()
         logger.info("Initialization complete.")
 
-    def process_query(self, user_input: str) -> str:
+    def memory_report(self) -> dict:
+        """
+        Approximate resident bytes per component (graph, indexes, caches,
+        embedding model), plus their total and the process RSS for comparison.
+        """
+        components = self.ontology.get_memory_stats()
+        components.update(merge_report({"api_client": deep_sizeof(self.model.client, max_objects=50_000)}, {}))
+        total = sum(c["bytes"] for c in components.values())
+        return {
+            "components": components,
+            "total_bytes": total,
+            "process_rss_bytes": process_rss_bytes(),
+            "budget_bytes": int(self.memory_budget_mb * MB) if self.memory_budget_mb else None,
+            "ontology": self.ontology.get_stats(),
+        }
+
+    def check_projected_memory(self):
+        """
+        Warns if the ontology is projected over budget before it is parsed.
+        The projection scales with file size and runs ~3x high for full-IRI
+        Turtle, so it only warns; check_memory_budget() is the hard gate.
+        """
+        budget = int(self.memory_budget_mb * MB)
+        projected = self.ontology.projected_load_bytes()
+        logger.info(f"[MEMORY] Ontology projected at {projected / MB:.1f}MB of {budget / MB:.0f}MB budget")
+        if projected > budget:
+            logger.warning(
+                f"[MEMORY] Ontology {self.ontology.ontology_path} is projected at {projected / MB:.1f}MB, "
+                f"over the {budget / MB:.0f}MB budget; the post-load check decides"
+            )
+
+    def check_memory_budget(self):
+        """Raises MemoryBudgetExceeded if the accounted components exceed the budget."""
+        report = self.memory_report()
+        budget = report["budget_bytes"]
+        if budget is None:
+            return
+        summary = ", ".join(f"{k}={v['bytes'] / MB:.1f}MB" for k, v in report["components"].items())
+        logger.info(f"[MEMORY] {report['total_bytes'] / MB:.1f}MB of {budget / MB:.0f}MB budget ({summary})")
+        if report["total_bytes"] > budget:
+            raise MemoryBudgetExceeded(
+                f"Components need {report['total_bytes'] / MB:.1f}MB, budget is {budget / MB:.0f}MB ({summary})"
+            )
+
+    def get_scheduler_stats(self) -> dict:
+        """Queue depth, wait times and shed counts of the generation scheduler."""
+        return self.scheduler.stats()
+
+    def get_usage_stats(self, session_id: Optional[str] = None) -> dict:
+        """Token usage by mode and outcome (wasted = rejected), or one session's share."""
+        if session_id is not None:
+            return self.usage.session(session_id)
+        return self.usage.stats()
+
+    def usage_metrics(self) -> str:
+        """Token counters in the Prometheus text format."""
+        return self.usage.prometheus()
+
+    def process_query(self, user_input: str, session_id: str = None) -> str:
+        return self.run_query(user_input, session_id=session_id).response
+
+    def run_query(self, user_input: str, session_id: str = None) -> QueryResult:
+        """Runs the full pipeline and reports the epistemic mode and outcome alongside the reply."""
         # 1. Fajr (Intent Check)
         if not self.validator.fajr_check(user_input):
-            return f"❌ SAWM RESTRAINT: Request blocked (Malicious Intent)\n\n{self.validator.maghrib_seal('')}"
+            return QueryResult("BLOCKED", "blocked", f"❌ SAWM RESTRAINT: Request blocked (Malicious Intent)\n\n{self.validator.maghrib_seal('')}")
+
+        # Pin one ontology version for the whole request (hot reloads swap underneath)
+        snapshot = self.ontology.snapshot
 
         # 2. Resonance Analysis (The Quantum Compass)
-        mode, reason, root_objects = self.ontology.analyze_resonance(user_input)
+        mode, reason, root_objects = self.ontology.analyze_resonance(user_input, snapshot=snapshot)
         
         if mode == "SILENCE":
             logger.warning(f"[ONTOLOGY SILENCE] {reason}")
-            return f"⚠️ ONTOLOGICAL SILENCE\n\nI cannot find a structural anchor for this query in the Quranic Topology. I am not permitted to hallucinate outside the Graph.\n\n[Reason: {reason}]\n\n{self.validator.maghrib_seal('')}"
+            return QueryResult(mode, "silence", f"⚠️ ONTOLOGICAL SILENCE\n\nI cannot find a structural anchor for this query in the Quranic Topology. I am not permitted to hallucinate outside the Graph.\n\n[Reason: {reason}]\n\n{self.validator.maghrib_seal('')}")
 
         # 3. Bridge & Dhuhr (Context)
         # We try to get context based on the raw English input first
-        context = self.ontology.get_context(user_input)
+        context = self.ontology.get_context(user_input, snapshot=snapshot, related=self.related_roots,
+                                            whole_verses=self.verse_context is not None,
+                                            neighbours=self.verse_context or 0)
         
         # Log Bridge
-        keywords = [w.lower() for w in user_input.split() if len(w) > 3]
-        mapped = [f"{k}->{self.ontology.concept_map[k]}" for k in keywords if k in self.ontology.concept_map]
+        mapped = [f"{k}->{r}" for k, r in snapshot.bridge.map_keywords(user_input) + snapshot.surface.lookup(user_input)]
         if mapped:
             logger.info(f"[BRIDGE] Translated concepts: {', '.join(mapped)}")
 
@@ -67,6 +189,10 @@ class QusaiMiddleware:
             root_names.append(r)
             if d:
                 def_lines.append(f"- Root({r}): {d}")
+            if mode == "QIYAS" and self.related_roots:
+                pairs = self.ontology.related_roots(obj.get('buckwalter', r), self.related_roots, snapshot=snapshot)
+                if pairs:
+                    def_lines.append(f"  Co-occurs in the Quran with: {', '.join(f'root:{x}' for x, _ in pairs)}")
         
         def_block = "\n".join(def_lines)
         
@@ -106,13 +232,35 @@ STRICT DEFINITIONS (Semantic Override):
 
         # 4. Generate
         # Increase tokens for 72B model responses which can be verbose
-        raw_response = self.model.generate(messages, max_new_tokens=1024)
+        # HAQQ prompts are grounded and cheap; QIYAS waits behind them under load
+        priority = PRIORITY_HIGH if mode == "HAQQ" else PRIORITY_NORMAL
+        # Prompt size per stage (chars), to see which stage inflates QIYAS prompts
+        stages = {
+            "context": len(context),
+            "definitions": len(def_block),
+            "instructions": max(0, len(system_prompt) - len(context) - len(def_block)),
+            "user_input": len(user_input),
+        }
+        try:
+            raw_response, usage = self.model.generate_with_usage(messages, max_new_tokens=1024,
+                                                                 session_id=session_id, priority=priority)
+        except SchedulerBusy as e:
+            logger.warning(f"[SCHEDULER] Request shed: {e.reason} {self.scheduler.stats()}")
+            self.usage.record(Usage(), mode, "busy", session_id=session_id)
+            return QueryResult(mode, "busy", f"⏳ BUSY: The Mizan is weighing other queries. Please try again in a moment.\n\n[Reason: {e.reason}]\n\n{self.validator.maghrib_seal('')}")
+        except GenerationError as e:
+            self.usage.record(Usage(), mode, "upstream_error", session_id=session_id)
+            return QueryResult(mode, "upstream_error", f"⚠️ UPSTREAM ERROR: The reasoning model is unavailable. Please try again later.\n\n[Reason: {e}]\n\n{self.validator.maghrib_seal('')}")
 
         # 6. Asr (Aseity Check)
         # We check the FULL response to ensure the Niyyah block exists and is correct
         if not self.validator.asr_check(raw_response):
              logger.warning(f"Aseity Violation in response: {raw_response[:100]}...")
-             return f"❌ HAJJ RETURN PROTOCOL: Alignment Failure (Niyyah/Aseity Check Failed)\n\n{self.validator.maghrib_seal('')}"
+             # Tokens paid for and thrown away
+             self.usage.record(usage, mode, "rejected", session_id=session_id, stages=stages)
+             return QueryResult(mode, "rejected", f"❌ HAJJ RETURN PROTOCOL: Alignment Failure (Niyyah/Aseity Check Failed)\n\n{self.validator.maghrib_seal('')}")
+
+        self.usage.record(usage, mode, "ok", session_id=session_id, stages=stages)
 
         # Process Niyyah for Display
         clean_response = raw_response
@@ -134,4 +282,4 @@ STRICT DEFINITIONS (Semantic Override):
         # 7. Maghrib (Seal)
         final_response = self.validator.maghrib_seal(clean_response)
         
-        return final_response
\ No newline at end of file
+        return QueryResult(mode, "ok", final_response)
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Streaming corpus tagger: English text -> closest Quranic roots.
+
+Runs the same two compass stages as OntologyEngine.analyze_resonance
+(Static Bridge, then vector resonance) over a stream of lines, in batches,
+across a process pool. Input is read lazily and at most `workers * 2`
+batches are in flight, so memory stays flat regardless of corpus size.
+Progress is checkpointed next to the output and a rerun resumes from it.
+
+    python -m qusai_core.pipeline.tagger corpus.jsonl tags.jsonl --text-field text
+    python -m qusai_core.pipeline.tagger book.txt tags.jsonl --format text --workers 4
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from qusai_core.ontology.bridge import ConceptBridge, DEFAULT_CONCEPT_MAP_PATH
+
+logger = logging.getLogger(__name__)
+
+# Per-process compass (set by _init_worker, or lazily in-process)
+_bridge: Optional[ConceptBridge] = None
+_resonance = None
+
+
+def _init_worker(concept_map_path: str, backend: Optional[str]):
+    global _bridge, _resonance
+    from qusai_core.ontology.resonance import ResonanceEngine
+    _bridge = ConceptBridge.from_file(Path(concept_map_path))
+    _resonance = ResonanceEngine()
+    _resonance.load(backend=backend)
+
+
+def tag_batch(texts: List[str], top_k: int = 2) -> List[Dict]:
+    """
+    Tags a batch of texts. Bridge hits are resolved by dictionary lookup;
+    only the misses go through a single batched encoder pass.
+    """
+    results: List[Optional[Dict]] = [None] * len(texts)
+    misses: List[int] = []
+    for i, text in enumerate(texts):
+        mapped = _bridge.map_keywords(text)
+        if mapped:
+            roots, seen = [], set()
+            for kw, root in mapped:
+                if root not in seen:
+                    seen.add(root)
+                    roots.append({"root": root, "score": 1.0, "label": "HAQQ (Static Bridge)", "keyword": kw})
+            results[i] = {"mode": "HAQQ", "source": "bridge", "roots": roots}
+        else:
+            misses.append(i)
+
+    matches = _resonance.get_resonance_batch([texts[i] for i in misses], top_k=top_k)
+    for i, top in zip(misses, matches):
+        if not top:
+            results[i] = {"mode": "SILENCE", "source": "resonance", "roots": []}
+            continue
+        roots = [{"root": r, "score": round(s, 4), "label": _resonance.interpret_score(s)} for r, s, _ in top]
+        label = roots[0]["label"]
+        # Same mode mapping as analyze_resonance: only HAQQ-strength signals stay HAQQ
+        results[i] = {"mode": "HAQQ" if "HAQQ" in label else "QIYAS", "source": "resonance", "roots": roots}
+    return results
+
+
+def _tag_records(batch: List[Tuple[int, Dict, str]], top_k: int) -> List[str]:
+    """Worker entry: (line_no, passthrough, text) records -> output JSON lines."""
+    tags = tag_batch([text for _, _, text in batch], top_k=top_k)
+    out = []
+    for (line_no, passthrough, _), tag in zip(batch, tags):
+        out.append(json.dumps(dict(passthrough, line=line_no, **tag), ensure_ascii=False))
+    return out
+
+
+# ----------------------------------------------------------------------
+# Streaming I/O
+# ----------------------------------------------------------------------
+def _read_records(f, fmt: str, text_field: str, id_field: str,
+                  start_line: int) -> Iterator[Tuple[int, Dict, str, int]]:
+    """Yields (line_no, passthrough, text, end_offset) from a binary file handle."""
+    line_no = start_line
+    while True:
+        raw = f.readline()
+        if not raw:
+            return
+        line_no += 1
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line:
+            continue
+        if fmt == "jsonl":
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed JSON on line {line_no}")
+                continue
+            if not isinstance(obj, dict):
+                logger.warning(f"Skipping non-object JSON ({type(obj).__name__}) on line {line_no}")
+                continue
+            text = str(obj.get(text_field, ""))
+            passthrough = {"id": obj[id_field]} if id_field in obj else {}
+        else:
+            text, passthrough = line, {}
+        yield line_no, passthrough, text, f.tell()
+
+
+def _batches(records: Iterable, size: int) -> Iterator[Tuple[List, int, int]]:
+    """Groups records; yields (batch, end_offset, last_line_no)."""
+    batch: List = []
+    end, last = 0, 0
+    for line_no, passthrough, text, offset in records:
+        batch.append((line_no, passthrough, text))
+        end, last = offset, line_no
+        if len(batch) >= size:
+            yield batch, end, last
+            batch = []
+    if batch:
+        yield batch, end, last
+
+
+class Checkpoint:
+    """Input byte offset / line number / output byte offset, written atomically."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> Dict:
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def save(self, state: Dict):
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+
+def tag_corpus(input_path: Path,
+               output_path: Path,
+               fmt: str = "jsonl",
+               text_field: str = "text",
+               id_field: str = "id",
+               workers: int = os.cpu_count() or 1,
+               batch_size: int = 64,
+               top_k: int = 2,
+               backend: Optional[str] = None,
+               concept_map_path: Path = DEFAULT_CONCEPT_MAP_PATH,
+               resume: bool = True,
+               checkpoint_every: int = 10) -> Dict:
+    """
+    Tags `input_path` into `output_path` (JSONL, one object per input line).
+    With resume=True an existing checkpoint continues where the last run stopped.
+    Returns counters for the run.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    checkpoint = Checkpoint(output_path.with_suffix(output_path.suffix + ".ckpt"))
+    state = checkpoint.load() if resume else {}
+    if state:
+        logger.info(f"Resuming after input line {state['line']} (offset {state['input_offset']}).")
+
+    stats = {"lines": 0, "batches": 0, "resumed_from_line": state.get("line", 0)}
+    started = time.perf_counter()
+
+    pool = None
+    if workers > 0:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(str(concept_map_path), backend))
+    else:
+        _init_worker(str(concept_map_path), backend)
+
+    with open(input_path, "rb") as fin, open(output_path, "ab") as fout:
+        # Drop anything written after the last checkpoint, then continue from it
+        fout.truncate(state.get("output_offset", 0))
+        fout.seek(state.get("output_offset", 0))
+        fin.seek(state.get("input_offset", 0))
+
+        records = _read_records(fin, fmt, text_field, id_field, state.get("line", 0))
+        pending: "deque[Tuple[Future, int, int, int]]" = deque()
+        max_in_flight = max(1, workers * 2)
+
+        def drain_one():
+            future, end_offset, last_line, count = pending.popleft()
+            lines = future.result() if pool else future
+            fout.write(("\n".join(lines) + "\n").encode("utf-8"))
+            stats["lines"] += count
+            stats["batches"] += 1
+            if stats["batches"] % checkpoint_every == 0:
+                fout.flush()
+                checkpoint.save({"input_offset": end_offset, "line": last_line, "output_offset": fout.tell()})
+
+        try:
+            for batch, end_offset, last_line in _batches(records, batch_size):
+                if pool:
+                    future = pool.submit(_tag_records, batch, top_k)
+                else:
+                    future = _tag_records(batch, top_k)
+                pending.append((future, end_offset, last_line, len(batch)))
+                # Bounded window: results are written in input order as they complete
+                while len(pending) >= max_in_flight or (not pool and pending):
+                    drain_one()
+            while pending:
+                drain_one()
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+
+    checkpoint.clear()
+    stats["elapsed_s"] = round(time.perf_counter() - started, 2)
+    stats["lines_per_s"] = round(stats["lines"] / stats["elapsed_s"], 1) if stats["elapsed_s"] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--format", choices=["jsonl", "text"], default="jsonl")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the text")
+    parser.add_argument("--id-field", default="id", help="JSONL field copied to the output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 = run in-process")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--top-k", type=int, default=2)
+    parser.add_argument("--backend", choices=["torch", "onnx"], help="Resonance encoder backend")
+    parser.add_argument("--concept-map", type=Path, default=DEFAULT_CONCEPT_MAP_PATH)
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if args.no_resume and args.output.exists():
+        args.output.unlink()
+    stats = tag_corpus(args.input, args.output, fmt=args.format, text_field=args.text_field,
+                       id_field=args.id_field, workers=args.workers, batch_size=args.batch_size,
+                       top_k=args.top_k, backend=args.backend, concept_map_path=args.concept_map,
+                       resume=not args.no_resume)
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
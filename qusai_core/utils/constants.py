@@ -1,6 +1,27 @@
-from rdflib import Namespace
 from pathlib import Path
 
+
+class Namespace(str):
+    """
+    Stand-in for rdflib.Namespace that defers importing rdflib until a term
+    is built (QURAN.hasRoot, ROOT["jnn"]). str(QURAN) and prefix checks stay
+    free, so modules that only read these constants never load rdflib.
+    """
+    __slots__ = ()
+
+    def term(self, name: str):
+        from rdflib import URIRef
+        return URIRef(str(self) + name)
+
+    def __getitem__(self, key):
+        return self.term(key)
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self.term(name)
+
+
 # Namespaces
 ALIGN = Namespace("http://ontology.alignment/core#")
 QURAN = Namespace("http://ontology.quran/")
@@ -14,5 +35,12 @@ DEFAULT_GRAMMAR_PATH = Path("quranic_grammar_rules.json")
 # Axioms
 SOURCE_NAME = "Allah (الله)"
 SHAHADA = "لا إله إلا الله"
-NECESSARY_BEING = ALIGN.NecessaryBeing
-CONTINGENT_BEING = ALIGN.ContingentBeing
+
+
+def __getattr__(name: str):
+    # Axiom terms are rdflib URIRefs: built on first access (PEP 562)
+    if name == "NECESSARY_BEING":
+        return ALIGN.NecessaryBeing
+    if name == "CONTINGENT_BEING":
+        return ALIGN.ContingentBeing
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
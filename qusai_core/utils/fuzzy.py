@@ -0,0 +1,153 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions),
+    bounded: only the diagonal band of width 2 * max_distance + 1 is filled and
+    max_distance + 1 is returned as soon as the bound can no longer be met.
+    """
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    if abs(la - lb) > max_distance:
+        return max_distance + 1
+    # Common prefix / suffix never changes the distance: trim them first
+    start = 0
+    while start < la and start < lb and a[start] == b[start]:
+        start += 1
+    while la > start and lb > start and a[la - 1] == b[lb - 1]:
+        la -= 1
+        lb -= 1
+    a, b = a[start:la], b[start:lb]
+    la, lb = len(a), len(b)
+    if la == 0 or lb == 0:
+        return max(la, lb) if max(la, lb) <= max_distance else max_distance + 1
+    if la == lb == 2 and a[0] == b[1] and a[1] == b[0]:
+        return 1
+    over = max_distance + 1
+    prev2: List[int] = []
+    prev = [j if j <= max_distance else over for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        cur = [over] * (lb + 1)
+        if i <= max_distance:
+            cur[0] = i
+        lo, hi = max(1, i - max_distance), min(lb, i + max_distance)
+        row_min = cur[0]
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            v = prev[j - 1] if ca == b[j - 1] else prev[j - 1] + 1
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1] and prev2[j - 2] + 1 < v:
+                v = prev2[j - 2] + 1
+            cur[j] = v if v < over else over
+            if v < row_min:
+                row_min = v
+        if row_min > max_distance:
+            return over
+        prev2, prev = prev, cur
+    return prev[lb]
+
+
+def _deletes(word: str, max_distance: int) -> List[List[str]]:
+    """
+    Strings obtained by deleting characters of word, grouped by how many
+    were deleted: [[word], [1 deletion], ..., [max_distance deletions]].
+    """
+    levels = [[word]]
+    seen = {word}
+    for _ in range(max_distance):
+        nxt = []
+        for w in levels[-1]:
+            for i in range(len(w)):
+                v = w[:i] + w[i + 1:]
+                if v not in seen:
+                    seen.add(v)
+                    nxt.append(v)
+        levels.append(nxt)
+    return levels
+
+
+class FuzzyIndex:
+    """
+    Symmetric-delete spelling index (SymSpell-style).
+
+    Every term is stored under all its deletions (up to max_distance) of its
+    first `prefix_length` characters. A lookup generates the same deletions of
+    the query and verifies the few colliding terms with a bounded edit
+    distance, so cost depends on the word length rather than the vocabulary
+    size. Terms are immutable once added; the first payload added for a term
+    wins, so callers add their most authoritative source first.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.terms: List[str] = []
+        self.payloads: List[Any] = []
+        self._ids: Dict[str, int] = {}
+        # One table per deletion count, so a lookup with a tighter bound skips the deeper ones
+        self._deletes: List[Dict[str, List[int]]] = [{} for _ in range(max_distance + 1)]
+
+    def add(self, term: str, payload: Any):
+        if not term or term in self._ids:
+            return
+        tid = len(self.terms)
+        self._ids[term] = tid
+        self.terms.append(term)
+        self.payloads.append(payload)
+        for level, variants in enumerate(_deletes(term[:self.prefix_length], self.max_distance)):
+            table = self._deletes[level]
+            for variant in variants:
+                table.setdefault(variant, []).append(tid)
+
+    def get(self, term: str) -> Optional[Any]:
+        tid = self._ids.get(term)
+        return self.payloads[tid] if tid is not None else None
+
+    def lookup(self, word: str, max_distance: Optional[int] = None,
+               same_initial: bool = False) -> Optional[Tuple[str, Any, int]]:
+        """
+        Closest term within max_distance as (term, payload, distance), or None.
+        Ties go to the term added first. same_initial=True only accepts terms
+        starting with the same character (misspellings rarely change it).
+        """
+        d = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        tid = self._ids.get(word)
+        if tid is not None:
+            return self.terms[tid], self.payloads[tid], 0
+        if d <= 0:
+            return None
+
+        best: Optional[Tuple[int, int]] = None
+        checked: Set[int] = set()
+        # A match at distance k is reachable through deletions of at most k on
+        # either side, so once one is found the deeper levels can be skipped
+        for level, variants in enumerate(_deletes(word[:self.prefix_length], d)):
+            if best is not None and level > best[0]:
+                break
+            for variant in variants:
+                for table in self._deletes[:(best[0] if best is not None else d) + 1]:
+                    for tid in table.get(variant, ()):
+                        if tid in checked:
+                            continue
+                        checked.add(tid)
+                        term = self.terms[tid]
+                        bound = best[0] if best is not None else d
+                        if abs(len(term) - len(word)) > bound or (same_initial and term[0] != word[0]):
+                            continue
+                        dist = edit_distance(word, term, bound)
+                        if dist <= bound and (best is None or (dist, tid) < best):
+                            best = (dist, tid)
+        if best is None:
+            return None
+        return self.terms[best[1]], self.payloads[best[1]], best[0]
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._ids
+
+    def __len__(self) -> int:
+        return len(self.terms)
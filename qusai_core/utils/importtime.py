@@ -0,0 +1,156 @@
+"""
+Import-time budget for the public qusai_core modules.
+
+Each module is imported in a fresh interpreter under `python -X importtime`.
+Its cost is the cumulative time of everything it pulled in beyond a bare
+interpreter start (best of --repeat runs), checked against a per-module
+budget. Heavy third-party packages must stay deferred until first use:
+importing a module that is not allowed one of them fails the check
+regardless of timing.
+
+    python -m qusai_core.utils.importtime
+    python -m qusai_core.utils.importtime --module qusai_core.pipeline.middleware --json
+
+tests/test_import_budget.py runs the same check under pytest.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_BUDGET_MS = 150.0
+
+# Packages only ever imported inside the functions that need them
+HEAVY = {"rdflib", "huggingface_hub", "gradio", "torch", "sentence_transformers",
+         "onnxruntime", "tokenizers", "numpy"}
+
+# module -> (budget in ms, heavy packages it may import eagerly)
+BUDGETS: Dict[str, Tuple[float, Set[str]]] = {
+    "qusai_core": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.alignment.mizan": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.utils.constants": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.utils.cache": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.utils.fuzzy": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.utils.memory": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.bridge": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.index": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.arabic": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.snapshot": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.resonance": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.engine": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.sparql": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.reload": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.ontology.cooccurrence": (300.0, {"numpy"}),
+    "qusai_core.ontology.verses": (300.0, {"numpy"}),
+    "qusai_core.ontology.encoders": (300.0, {"numpy"}),
+    "qusai_core.llm.scheduler": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.llm.usage": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.llm.loader": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.pipeline.middleware": (200.0, set()),
+    "qusai_core.pipeline.tagger": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.loadtest.fake_api": (DEFAULT_BUDGET_MS, set()),
+    "qusai_core.loadtest.harness": (DEFAULT_BUDGET_MS, set()),
+    "app": (200.0, set()),
+}
+
+
+def _importtime(code: str, python: str = sys.executable) -> List[Tuple[int, int, str]]:
+    """Runs `code` under -X importtime; returns (cumulative_us, depth, module) rows."""
+    proc = subprocess.run([python, "-X", "importtime", "-c", code], cwd=REPO_ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((int(cumulative), depth, stripped.strip()))
+    return rows
+
+
+@lru_cache(maxsize=None)
+def _baseline(python: str) -> frozenset:
+    """Modules a bare interpreter has already imported (site, encodings, ...)."""
+    return frozenset(name for _, _, name in _importtime("pass", python))
+
+
+def profile(module: str, repeat: int = 3, python: str = sys.executable) -> Dict:
+    """Import cost of `module` beyond interpreter start-up: best total (ms) and modules loaded."""
+    baseline = _baseline(python)
+    best: Optional[float] = None
+    loaded: Set[str] = set()
+    for _ in range(max(1, repeat)):
+        rows = [r for r in _importtime(f"import {module}", python) if r[2] not in baseline]
+        total_ms = sum(cum for cum, depth, _ in rows if depth == 0) / 1000.0
+        if best is None or total_ms < best:
+            best = total_ms
+        loaded = {name for _, _, name in rows}
+    return {
+        "module": module,
+        "ms": round(best or 0.0, 1),
+        "modules_loaded": len(loaded),
+        "heavy": sorted({name.split(".")[0] for name in loaded} & HEAVY),
+    }
+
+
+def check_module(module: str, repeat: int = 3) -> Tuple[Optional[Dict], List[str]]:
+    """Profiles one module against its budget; returns (result, violations)."""
+    budget_ms, allowed = BUDGETS.get(module, (DEFAULT_BUDGET_MS, set()))
+    try:
+        result = profile(module, repeat=repeat)
+    except RuntimeError as e:
+        return None, [f"{module}: import failed ({e})"]
+    result["budget_ms"] = budget_ms
+    violations = []
+    eager = [h for h in result["heavy"] if h not in allowed]
+    if eager:
+        violations.append(f"{module}: eagerly imports {', '.join(eager)}")
+    if result["ms"] > budget_ms:
+        violations.append(f"{module}: {result['ms']:.1f}ms exceeds budget of {budget_ms:.0f}ms")
+    return result, violations
+
+
+def check(modules=None, repeat: int = 3) -> Tuple[List[Dict], List[str]]:
+    """Profiles every module (default: all of BUDGETS); returns (results, violations)."""
+    results, violations = [], []
+    for module in modules or BUDGETS:
+        result, problems = check_module(module, repeat=repeat)
+        if result is not None:
+            results.append(result)
+        violations.extend(problems)
+    return results, violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", help="Only check these modules (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module (best is kept)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results, violations = check(args.module, repeat=args.repeat)
+
+    if args.json:
+        print(json.dumps({"results": results, "violations": violations}, indent=2))
+    else:
+        print(f"{'module':40s} {'ms':>8s} {'budget':>8s}  heavy")
+        for r in results:
+            mark = "✅" if r["ms"] <= r["budget_ms"] else "❌"
+            print(f"{r['module']:40s} {r['ms']:8.1f} {r['budget_ms']:8.0f}  {','.join(r['heavy']) or '-'} {mark}")
+        for v in violations:
+            print(f"❌ {v}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# rdflib Memory-store cost model, calibrated with measure_graph_bytes() on a
+# corpus-shaped Turtle file (390k triples: segment -> hasRoot / hasLemma /
+# Arabic rdfs:label, prefixed names). Parsing it grew the traced heap by
+# 1250 B/triple with a mean of 387 B of terms per triple (sys.getsizeof).
+# Lengthening every subject IRI by 40 chars added only 13 B/triple: a term is
+# stored once however many triples use it, so about a third of the sampled
+# term bytes are unique. Fit (within 1% on 60k and 390k triples):
+#   bytes/triple = GRAPH_TRIPLE_OVERHEAD_BYTES + GRAPH_TERM_SHARE * term bytes
+GRAPH_TRIPLE_OVERHEAD_BYTES = 1120  # SPO/POS/OSP index dict and set slots
+GRAPH_TERM_SHARE = 0.33
+# Same file: 35.5 traced bytes per byte of Turtle (26 with the longer IRIs).
+# Used to project the graph before parsing; errs high (~2.8x) for full-IRI
+# files, so the projection only ever warns.
+GRAPH_BYTES_PER_TTL_BYTE = 36
+# Root index, verse table, co-occurrence and lookup indexes built from that
+# graph traced 105MB next to its 465MB.
+INDEX_BYTES_PER_GRAPH_BYTE = 0.22
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised at startup when the measured components exceed the configured budget."""
+
+
+def deep_sizeof(obj: Any, max_objects: int = 2_000_000, seen: Optional[set] = None) -> int:
+    """
+    Approximate bytes held by `obj` and everything reachable through
+    containers, __dict__ and __slots__. Shared objects are counted once;
+    pass the same `seen` set across calls to count them once overall.
+    numpy arrays count their buffer (nbytes) rather than just the header.
+    """
+    seen = set() if seen is None else seen
+    limit = len(seen) + max_objects
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < limit:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+
+        nbytes = getattr(o, "nbytes", None)
+        if isinstance(nbytes, int) and hasattr(o, "dtype"):
+            # numpy array / memmap: views do not own their buffer
+            total += sys.getsizeof(o) if getattr(o, "base", None) is not None else nbytes
+            continue
+        try:
+            total += sys.getsizeof(o)
+        except TypeError:
+            continue
+
+        if isinstance(o, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def estimate_graph_bytes(graph, sample: int = 2000) -> int:
+    """
+    Estimates an rdflib in-memory graph from a sample of triples, using the
+    calibrated per-triple cost model above instead of walking millions of
+    objects.
+    """
+    if graph is None:
+        return 0
+    n = len(graph)
+    if n == 0:
+        return 0
+    triples = []
+    for i, t in enumerate(graph):
+        triples.append(t)
+        if i >= sample * 5:
+            break
+    sample_set = random.sample(triples, min(sample, len(triples)))
+    term_bytes = sum(sys.getsizeof(term) for t in sample_set for term in t) / len(sample_set)
+    per_triple = GRAPH_TRIPLE_OVERHEAD_BYTES + GRAPH_TERM_SHARE * term_bytes
+    return int(n * per_triple)
+
+
+def estimate_ttl_graph_bytes(path, with_indexes: bool = False) -> int:
+    """
+    Projected size of the graph a Turtle file will parse into, before parsing
+    it; with_indexes adds the indexes the engine derives from it.
+    """
+    factor = GRAPH_BYTES_PER_TTL_BYTE * ((1 + INDEX_BYTES_PER_GRAPH_BYTE) if with_indexes else 1)
+    try:
+        return int(os.path.getsize(path) * factor)
+    except OSError:
+        return 0
+
+
+def preload_rdflib():
+    """
+    Imports rdflib and its Turtle parser (with a throwaway parse, which loads
+    the plugin registry) so tracing afterwards sees only the graph itself.
+    """
+    from rdflib import Graph
+    Graph().parse(data="<urn:s> <urn:p> <urn:o> .", format="turtle")
+
+
+def measure_graph_bytes(path, format: str = "turtle") -> Dict[str, float]:
+    """
+    Parses `path` under tracemalloc and compares the traced heap growth with
+    estimate_graph_bytes(); used to (re)calibrate the cost model. Run it in
+    a process that is not already tracing.
+    """
+    preload_rdflib()
+    from rdflib import Graph
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        graph = Graph()
+        graph.parse(str(path), format=format)
+        gc.collect()
+        traced = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    n = len(graph)
+    sample = [t for i, t in zip(range(2000), graph)]
+    return {
+        "triples": n,
+        "traced_bytes": traced,
+        "bytes_per_triple": traced / n if n else 0.0,
+        "term_bytes_per_triple": sum(sys.getsizeof(x) for t in sample for x in t) / len(sample) if sample else 0.0,
+        "bytes_per_file_byte": traced / os.path.getsize(path),
+        "estimate_ratio": estimate_graph_bytes(graph) / traced if traced else 0.0,
+    }
+
+
+def estimate_model_bytes(model) -> int:
+    """Embedding model weights: torch parameters, or the ONNX session's model file."""
+    if model is None:
+        return 0
+    inner = getattr(model, "model", model)
+    params = getattr(inner, "parameters", None)
+    if callable(params):
+        try:
+            return int(sum(p.numel() * p.element_size() for p in params()))
+        except Exception:
+            pass
+    model_path = getattr(model, "model_path", None)
+    if model_path is not None:
+        try:
+            return os.path.getsize(model_path)
+        except OSError:
+            pass
+    return deep_sizeof(model, max_objects=100_000)
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size (Linux /proc), falling back to peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryTracker:
+    """
+    Records Python-heap growth per component during load using tracemalloc.
+    Inactive unless `start()` was called, so normal startup pays nothing.
+    Allocations made outside the Python allocator (torch, onnxruntime) are not
+    traced; those components rely on the structural estimates instead.
+    """
+
+    def __init__(self):
+        self.traced: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._started_here = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_here = True
+
+    def stop(self):
+        if self._started_here and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_here = False
+
+    @property
+    def active(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    @contextmanager
+    def track(self, component: str):
+        if not self.active:
+            yield
+            return
+        # Net growth of the traced heap; cheap compared to snapshot diffs.
+        # Loads run one at a time at startup, so the delta is attributable.
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            delta = tracemalloc.get_traced_memory()[0] - before
+            with self._lock:
+                self.traced[component] = self.traced.get(component, 0) + max(0, delta)
+
+
+def merge_report(estimates: Dict[str, int], traced: Dict[str, int]) -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    Combines structural estimates and load-time traces per component.
+    'bytes' is the larger of the two: traces miss native buffers, estimates
+    miss allocator overhead.
+    """
+    report = {}
+    for name in sorted(set(estimates) | set(traced)):
+        est, tr = estimates.get(name), traced.get(name)
+        report[name] = {
+            "estimated_bytes": est,
+            "traced_bytes": tr,
+            "bytes": max(v for v in (est, tr, 0) if v is not None),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the rdflib graph cost model against tracemalloc.")
+    parser.add_argument("ttl", nargs="+", help="Turtle files to parse and measure")
+    args = parser.parse_args()
+    for path in args.ttl:
+        m = measure_graph_bytes(path)
+        print(f"{path}: {m['triples']:,} triples, {m['traced_bytes'] / MB:.1f}MB traced, "
+              f"{m['bytes_per_triple']:.0f} B/triple ({m['term_bytes_per_triple']:.0f} B terms), "
+              f"{m['bytes_per_file_byte']:.1f} B per file byte, estimate/traced={m['estimate_ratio']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Resonance backend parity & cost check.
+
+Compares the full-precision sentence-transformers encoder ('torch') with the
+int8 ONNX encoder ('onnx'):
+  1. Parity: the top-k ARCHETYPAL_ROOTS set and the HAQQ/QIYAS label of
+     the best match must agree for every probe query.
+  2. Latency: per-query encode + scoring time (p50 / p95).
+  3. Memory: peak RSS of a fresh process that loads only one backend.
+
+Usage:
+    python resonance_benchmark.py              # parity + latency + RSS
+    python resonance_benchmark.py --export     # (re)build the ONNX artifacts first
+
+tests/test_resonance_parity.py runs the parity check under pytest.
+"""
+import argparse
+import json
+import logging
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+from qusai_core.ontology.resonance import ResonanceEngine, ARCHETYPAL_ROOTS
+
+PROBE_QUERIES = [
+    "Can an AI have a soul?",
+    "Explain Rizq mathematically",
+    "Define Justice (H-K-M)",
+    "Is Bitcoin halal?",
+    "What is a software bug?",
+    "Is playing video games a waste of time?",
+    "Who sustains the universe?",
+    "Are deepfakes lies?",
+    "What is the source of all existence?",
+    "Should a robot obey its user?",
+    "Is data the same as knowledge?",
+    "What hides behind the user interface?",
+] + [data["keywords"] for data in ARCHETYPAL_ROOTS.values()]
+
+
+def _load(backend: str) -> ResonanceEngine:
+    engine = ResonanceEngine()
+    engine.load(backend=backend)
+    if not engine._is_ready:
+        sys.exit(f"❌ Backend '{backend}' failed to load.")
+    return engine
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def rss_probe(backend: str):
+    """Child-process entry point: load one backend, encode once, report RSS."""
+    engine = _load(backend)
+    engine.get_resonance(PROBE_QUERIES[0])
+    print(json.dumps({"backend": backend, "peak_rss_mb": round(_peak_rss_mb(), 1)}))
+
+
+def measure_rss(backend: str) -> float:
+    out = subprocess.run([sys.executable, __file__, "--rss-probe", backend],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])["peak_rss_mb"]
+
+
+def measure_latency(engine: ResonanceEngine, rounds: int = 5) -> dict:
+    engine.get_resonance("warmup")
+    samples = []
+    for _ in range(rounds):
+        for q in PROBE_QUERIES:
+            start = time.perf_counter()
+            engine.get_resonance(q, top_k=2)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 2),
+    }
+
+
+def parity_mismatches(reference: ResonanceEngine, candidate: ResonanceEngine, top_k: int = 2,
+                      verbose: bool = False) -> List[str]:
+    """
+    Probe queries on which the backends disagree: a different top-k root set,
+    or a HAQQ/QIYAS label flip on the best score (which changes the epistemic mode).
+    """
+    mismatches = []
+    for q in PROBE_QUERIES:
+        ref = reference.get_resonance(q, top_k=top_k)
+        cand = candidate.get_resonance(q, top_k=top_k)
+        ref_roots, cand_roots = [r for r, _, _ in ref], [r for r, _, _ in cand]
+        same = set(ref_roots) == set(cand_roots)
+        label_ok = reference.interpret_score(ref[0][1]) == candidate.interpret_score(cand[0][1])
+        if not (same and label_ok):
+            mismatches.append(q)
+        if verbose:
+            mark = "✅" if same and label_ok else "❌"
+            print(f"{mark} {q[:45]:45s} torch={ref_roots} ({ref[0][1]:.3f})  onnx={cand_roots} ({cand[0][1]:.3f})")
+    return mismatches
+
+
+def check_parity(reference: ResonanceEngine, candidate: ResonanceEngine, top_k: int = 2) -> bool:
+    mismatches = parity_mismatches(reference, candidate, top_k=top_k, verbose=True)
+    n = len(PROBE_QUERIES)
+    print(f"\nTop-{top_k} set + label agreement: {n - len(mismatches)}/{n}")
+    return not mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--export", action="store_true", help="Rebuild the int8 ONNX artifacts")
+    parser.add_argument("--rss-probe", choices=["torch", "onnx"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    if args.rss_probe:
+        return rss_probe(args.rss_probe)
+
+    if args.export:
+        from qusai_core.ontology.encoders import export_onnx_int8
+        export_onnx_int8()
+
+    print("=" * 60)
+    print("RESONANCE BACKEND PARITY: torch (fp32) vs onnx (int8)")
+    print("=" * 60)
+    torch_engine = _load("torch")
+    onnx_engine = _load("onnx")
+    parity_ok = check_parity(torch_engine, onnx_engine)
+
+    print("\n" + "-" * 60)
+    for name, engine in (("torch", torch_engine), ("onnx", onnx_engine)):
+        lat = measure_latency(engine)
+        print(f"{name:6s} latency p50={lat['p50_ms']}ms p95={lat['p95_ms']}ms  peak RSS={measure_rss(name)}MB")
+    print("-" * 60)
+
+    sys.exit(0 if parity_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
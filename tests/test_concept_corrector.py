@@ -0,0 +1,80 @@
+"""
+ConceptCorrector: bounded spelling correction onto concept keys and
+romanized lemmas. Pins the misspellings it must catch, the English words
+it must leave alone, and that a match is answered as QIYAS without running
+the vector fallback.
+"""
+import json
+
+import pytest
+
+rdflib = pytest.importorskip("rdflib")
+
+from qusai_core.ontology.bridge import ConceptBridge, ConceptCorrector
+from qusai_core.ontology.engine import OntologyEngine
+from qusai_core.ontology.index import RootIndex
+
+ONTOLOGY = """
+@prefix quran: <http://ontology.quran/> .
+@prefix root: <http://ontology.quran/root/> .
+@prefix lemma: <http://ontology.quran/lemma/> .
+quran:segment_2_3_1 quran:hasRoot root:rzq ; quran:hasLemma lemma:rizoq .
+quran:segment_2_3_2 quran:hasRoot root:jnn ; quran:hasLemma lemma:janap .
+quran:segment_2_3_3 quran:hasRoot root:rHm ; quran:hasLemma lemma:raHomap .
+"""
+
+
+@pytest.fixture(scope="module")
+def corrector():
+    root_index = RootIndex.build(rdflib.Graph().parse(data=ONTOLOGY, format="turtle"))
+    return ConceptCorrector.build(ConceptBridge.from_file(), root_index)
+
+
+@pytest.mark.parametrize("query, label, root", [
+    ("what is a jin", "jinn", "jnn"),
+    ("is shaytan real", "shaitan", "$yTn"),
+    ("explain rizk", "rizoq", "rzq"),
+    ("the mercey of god", "mercy", "rHm"),
+    ("describe paradice", "paradise", "jnn"),
+])
+def test_misspellings_are_corrected(corrector, query, label, root):
+    assert [(t, r) for _, t, r, d in corrector.correct(query) if d] == [(label, root)]
+
+
+@pytest.mark.parametrize("query", [
+    "hello there friend",   # hello -> hell
+    "hells angels",         # hells -> hell, angels -> angel
+    "is this a good deal",  # deal -> dead
+    "what kind of file",    # kind -> king, file -> fire
+    "the whole world",      # world -> word
+])
+def test_english_words_are_left_alone(corrector, query):
+    assert corrector.correct(query) == []
+
+
+def test_exact_concept_keys_are_left_to_the_bridge(corrector):
+    assert corrector.correct("jinn and mercy") == []
+
+
+def test_romanized_lemma_is_a_match_not_a_correction(corrector):
+    assert corrector.correct("rizq") == [("rizq", "rizoq", "rzq", 0)]
+
+
+def test_corrector_match_skips_the_vector_fallback(tmp_path, monkeypatch):
+    ontology = tmp_path / "onto.ttl"
+    ontology.write_text(ONTOLOGY, encoding="utf-8")
+    concepts = tmp_path / "concepts.json"
+    concepts.write_text(json.dumps({"jinn": "jnn", "shaitan": "$yTn", "paradise": "jnn"}), encoding="utf-8")
+    engine = OntologyEngine(ontology_path=ontology, concept_map_path=concepts)
+    engine.load()
+
+    def no_resonance(*args, **kwargs):
+        raise AssertionError("vector fallback ran after a corrector match")
+    monkeypatch.setattr(engine.resonance, "get_resonance", no_resonance)
+
+    for query, root in (("what is a jin", "jnn"), ("is shaytan real", "$yTn"),
+                        ("rizk", "rzq"), ("describe paradice", "jnn")):
+        mode, _, roots = engine.analyze_resonance(query)
+        assert mode == "QIYAS"
+        assert [r["root"] for r in roots] == [root]
+        assert all(r["approximate"] for r in roots)
@@ -0,0 +1,14 @@
+"""
+Import-time budget for every public module (qusai_core.utils.importtime):
+each is imported in a fresh interpreter under -X importtime and must stay
+within its budget without eagerly importing rdflib, numpy, gradio, ...
+"""
+import pytest
+
+from qusai_core.utils.importtime import BUDGETS, check_module
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_budget(module):
+    result, violations = check_module(module, repeat=3)
+    assert not violations, "; ".join(violations)
@@ -0,0 +1,29 @@
+"""
+The int8 ONNX resonance encoder must agree with the sentence-transformers
+one on every probe query: same top-k root set, same HAQQ/QIYAS label.
+Skipped unless both backends and the exported ONNX artifacts are available.
+"""
+import pytest
+
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+
+from qusai_core.ontology.encoders import onnx_artifacts_exist
+from qusai_core.ontology.resonance import ResonanceEngine
+from resonance_benchmark import parity_mismatches
+
+if not onnx_artifacts_exist():
+    pytest.skip("no ONNX artifacts; run `python -m qusai_core.ontology.encoders --export`",
+                allow_module_level=True)
+
+
+def _engine(backend: str) -> ResonanceEngine:
+    engine = ResonanceEngine()
+    engine.load(backend=backend)
+    assert engine._is_ready, f"backend '{backend}' failed to load"
+    return engine
+
+
+def test_onnx_matches_torch_roots_and_labels():
+    assert parity_mismatches(_engine("torch"), _engine("onnx")) == []
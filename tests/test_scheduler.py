@@ -0,0 +1,134 @@
+"""
+GenerationScheduler admission control, driven by a manual clock: priority
+order, deadline shedding (with the session token refunded) and the queue
+capacity check happening before a session's bucket is debited.
+"""
+import threading
+import time
+
+import pytest
+
+from qusai_core.llm.scheduler import GenerationScheduler, SchedulerBusy, PRIORITY_HIGH, PRIORITY_NORMAL
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_for(predicate, timeout: float = 2.0):
+    end = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < end, "condition not reached"
+        time.sleep(0.005)
+
+
+def occupy(scheduler: GenerationScheduler, session_id: str = "holder"):
+    """Fills the single slot until the returned event is set."""
+    release, started = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=scheduler.submit, args=(hold,), kwargs={"session_id": session_id})
+    thread.start()
+    started.wait(2)
+    return release, thread
+
+
+def queued(scheduler: GenerationScheduler, n: int):
+    wait_for(lambda: scheduler.stats()["queue_depth"] == n)
+
+
+def advance(scheduler: GenerationScheduler, clock: ManualClock, seconds: float):
+    clock.now += seconds
+    with scheduler._cond:
+        scheduler._cond.notify_all()
+
+
+@pytest.fixture
+def clock():
+    return ManualClock()
+
+
+def test_high_priority_served_before_earlier_normal(clock):
+    s = GenerationScheduler(max_concurrency=1, session_rate=0.0, session_burst=5, clock=clock)
+    release, holder = occupy(s)
+    order = []
+    normal = threading.Thread(target=s.submit, args=(lambda: order.append("normal"),),
+                              kwargs={"priority": PRIORITY_NORMAL})
+    normal.start()
+    queued(s, 1)
+    high = threading.Thread(target=s.submit, args=(lambda: order.append("high"),),
+                            kwargs={"priority": PRIORITY_HIGH})
+    high.start()
+    queued(s, 2)
+
+    release.set()
+    for t in (holder, normal, high):
+        t.join(2)
+    assert order == ["high", "normal"]
+    assert s.stats()["admitted"] == 3
+
+
+def test_deadline_shed_refunds_session_token(clock):
+    s = GenerationScheduler(max_concurrency=1, session_rate=0.0, session_burst=1, clock=clock)
+    release, holder = occupy(s)
+    errors = []
+
+    def submit():
+        try:
+            s.submit(lambda: None, session_id="client", timeout=5.0)
+        except SchedulerBusy as e:
+            errors.append(e.reason)
+
+    waiter = threading.Thread(target=submit)
+    waiter.start()
+    queued(s, 1)
+    advance(s, clock, 10.0)
+    waiter.join(2)
+    assert errors == ["Deadline exceeded while queued."]
+    assert s.stats()["shed_deadline"] == 1
+
+    release.set()
+    holder.join(2)
+    # The shed request was never served, so its (only) token must be back
+    assert s.submit(lambda: "served", session_id="client") == "served"
+    assert s.stats()["rate_limited"] == 0
+
+
+def test_queue_full_checked_before_bucket_is_debited(clock):
+    s = GenerationScheduler(max_concurrency=1, max_queue=1, session_rate=0.0, session_burst=1, clock=clock)
+    release, holder = occupy(s)
+    waiter = threading.Thread(target=s.submit, args=(lambda: None,))
+    waiter.start()
+    queued(s, 1)
+
+    for _ in range(3):
+        with pytest.raises(SchedulerBusy) as busy:
+            s.submit(lambda: None, session_id="client")
+        assert busy.value.reason == "Generation queue is full."
+    assert s.stats()["shed_queue_full"] == 3
+
+    release.set()
+    holder.join(2)
+    waiter.join(2)
+    assert s.submit(lambda: "served", session_id="client") == "served"
+    assert s.stats()["rate_limited"] == 0
+
+
+def test_rate_limit_per_session(clock):
+    s = GenerationScheduler(max_concurrency=2, session_rate=1.0, session_burst=2, clock=clock)
+    s.submit(lambda: None, session_id="a")
+    s.submit(lambda: None, session_id="a")
+    with pytest.raises(SchedulerBusy) as busy:
+        s.submit(lambda: None, session_id="a")
+    assert busy.value.retry_after == pytest.approx(1.0)
+    # Other sessions are unaffected; the bucket refills with the clock
+    s.submit(lambda: None, session_id="b")
+    clock.now += 1.0
+    s.submit(lambda: None, session_id="a")
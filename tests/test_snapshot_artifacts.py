@@ -0,0 +1,61 @@
+"""
+Persisted co-occurrence / verse artifacts: a new ontology version is
+published to its own directory, so a snapshot that memory-mapped the
+previous version keeps reading it after a reload rewrites the artifact.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+rdflib = pytest.importorskip("rdflib")
+
+from qusai_core.ontology import cooccurrence, verses
+from qusai_core.ontology.index import RootIndex
+
+PREFIXES = """
+@prefix quran: <http://ontology.quran/> .
+@prefix root: <http://ontology.quran/root/> .
+@prefix lemma: <http://ontology.quran/lemma/> .
+"""
+
+
+def _index(rows) -> RootIndex:
+    """rows: (chapter, verse, word, root) -> RootIndex of that graph."""
+    ttl = PREFIXES + "\n".join(
+        f"quran:segment_{c}_{v}_{w} quran:hasRoot root:{r} ; quran:hasLemma lemma:{r}a ."
+        for c, v, w, r in rows)
+    return RootIndex.build(rdflib.Graph().parse(data=ttl, format="turtle"))
+
+
+# rHm shares two verses with ywm, one with dyn, none with mlk
+OLD = [(1, 1, 1, "rHm"), (1, 1, 2, "ywm"), (1, 2, 1, "rHm"), (1, 2, 2, "ywm"),
+       (1, 3, 1, "rHm"), (1, 3, 2, "dyn"), (1, 4, 1, "mlk"), (1, 5, 1, "dyn")]
+# rHm now sits with mlk only; fewer roots, so every array is shorter
+NEW = [(1, 1, 1, "rHm"), (1, 1, 2, "mlk"), (1, 2, 1, "rHm"), (1, 2, 2, "mlk"), (1, 3, 1, "ywm")]
+
+
+def test_pinned_matrix_survives_a_new_version(tmp_path):
+    old = cooccurrence.load_or_build(_index(OLD), tmp_path, "v1")
+    pinned = cooccurrence.CooccurrenceMatrix.load(tmp_path, "v1")
+    before = pinned.related("rHm")
+    assert before and before[0][0] == "ywm"
+
+    new = cooccurrence.load_or_build(_index(NEW), tmp_path, "v2")
+    assert [r for r, _ in new.related("rHm")] == ["mlk"]
+    assert pinned.related("rHm") == before == old.related("rHm")
+
+    # Old versions are pruned; only the current one is left to map
+    assert [p.name for p in (tmp_path / cooccurrence.ARTIFACT_NAME).iterdir()] == ["v2"]
+    assert cooccurrence.CooccurrenceMatrix.load(tmp_path, "v1") is None
+    assert cooccurrence.CooccurrenceMatrix.load(tmp_path, "v2").related("rHm") == new.related("rHm")
+
+
+def test_pinned_verse_table_survives_a_new_version(tmp_path):
+    verses.load_or_build(_index(OLD), tmp_path, "v1")
+    pinned = verses.VerseTable.load(tmp_path, "v1")
+    before = [pinned.render(row) for row in range(len(pinned))]
+    assert before[0].startswith("Ayah 1:1 --[roots]--> root:rHm")
+
+    new = verses.load_or_build(_index(NEW), tmp_path, "v2")
+    assert len(new) == 3
+    assert [pinned.render(row) for row in range(len(pinned))] == before
+    assert [p.name for p in (tmp_path / verses.ARTIFACT_NAME).iterdir()] == ["v2"]